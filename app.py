@@ -29,10 +29,26 @@ def get_assistant():
         'user': os.getenv('MYSQL_USER', 'root'),
         'password': os.getenv('MYSQL_PASSWORD', ''),
         'database': os.getenv('MYSQL_DATABASE', 'test'),
-        'model': 'gpt-4'
+        'pool_size': int(os.getenv('MYSQL_POOL_SIZE', 10)),
+        'result_limit': int(os.getenv('RESULT_LIMIT', 1000)),
+        'model': os.getenv('AI_MODEL', 'gpt-4'),
+        'fast_model': os.getenv('AI_FAST_MODEL', 'gpt-4o-mini')
     }
     return QueryAssistant(config)
 
+
+@st.cache_data(ttl=60)
+def cached_tables():
+    """List tables, cached across reruns"""
+    return get_assistant().db_manager.get_tables()
+
+
+@st.cache_data(ttl=60)
+def cached_table_analysis(table_name):
+    """Schema, statistics and insights for a table, cached across reruns"""
+    return get_assistant().analyze_table(table_name)
+
+
 # Main app
 def main():
     """Main application"""
@@ -90,30 +106,58 @@ def show_ask_interface():
         if question:
             with st.spinner("Processing your question..."):
                 assistant = get_assistant()
-                result = assistant.ask(question)
                 
-                if result['success']:
-                    # Display generated query
+                # Stream the generated query as it forms
+                stream_area = st.empty()
+                with stream_area.container():
                     st.subheader("📝 Generated SQL Query")
-                    st.code(result['query'], language='sql')
-                    
-                    # Display results
-                    st.subheader("📊 Results")
-                    st.dataframe(result['results'], use_container_width=True)
-                    
-                    # Display AI explanation
-                    st.subheader("💡 AI Explanation")
-                    st.info(result['explanation'])
-                    
-                    # Display optimization suggestions
-                    if result['optimization']['issues_found']:
-                        st.subheader("⚡ Performance Notes")
-                        for issue in result['optimization']['issues_found']:
-                            st.warning(f"**{issue['type']}**: {issue['message']}")
-                else:
-                    st.error(f"Error: {result['error']}")
+                    streamed_query = st.write_stream(
+                        assistant.ask_stream(question)
+                    )
+                
+                # Keep the result so paging through rows survives reruns
+                st.session_state['ask_result'] = assistant.ask(
+                    question,
+                    query=streamed_query
+                )
+                stream_area.empty()
         else:
             st.warning("Please enter a question")
+    
+    result = st.session_state.get('ask_result')
+    if result:
+        if result['success']:
+            # Display generated query
+            st.subheader("📝 Generated SQL Query")
+            st.code(result['query'], language='sql')
+            
+            # Display results
+            st.subheader("📊 Results")
+            display_dataframe_quickly(result['results'])
+            
+            # Display AI explanation
+            st.subheader("💡 AI Explanation")
+            st.info(result['explanation'])
+            
+            # Display optimization suggestions
+            if result['optimization']['issues']:
+                st.subheader("⚡ Performance Notes")
+                for issue in result['optimization']['issues']:
+                    st.warning(f"**{issue['type']}**: {issue['message']}")
+        else:
+            st.error(f"Error: {result['error']}")
+
+
+def display_dataframe_quickly(df, max_rows=2000):
+    """Show a window of at most max_rows rows instead of the whole frame"""
+    if len(df) <= max_rows:
+        st.dataframe(df, use_container_width=True)
+        return
+    
+    start = st.slider("Start row", 0, len(df) - max_rows, 0, step=1)
+    end = min(start + max_rows, len(df))
+    st.caption(f"Showing rows {start:,}–{end:,} of {len(df):,}")
+    st.dataframe(df.iloc[start:end], use_container_width=True)
 
 
 def show_optimize_interface():
@@ -175,10 +219,13 @@ def show_insights_interface():
     """Show database insights interface"""
     st.header("📊 Database Insights")
     
-    assistant = get_assistant()
+    if st.button("🔄 Refresh cache"):
+        cached_tables.clear()
+        cached_table_analysis.clear()
+        get_assistant().refresh_schema()
     
     # Get tables
-    tables = assistant.db_manager.get_tables()
+    tables = cached_tables()
     
     if tables:
         selected_table = st.selectbox("Select Table", tables)
@@ -186,9 +233,10 @@ def show_insights_interface():
         if st.button("🔍 Analyze Table", type="primary"):
             with st.spinner(f"Analyzing {selected_table}..."):
                 # Get table info
-                schema = assistant.db_manager.get_table_schema(selected_table)
-                stats = assistant.db_manager.get_table_statistics(selected_table)
-                insights = assistant.get_insights(selected_table)
+                analysis = cached_table_analysis(selected_table)
+                schema = analysis['schema']
+                stats = analysis['stats']
+                insights = analysis['insights']
                 
                 # Display schema
                 st.subheader("📋 Schema")
@@ -2,19 +2,41 @@
 Command Line Interface for MySQL AI Assistant
 """
 import argparse
+import asyncio
+import os
+import socket
+import stat
 import sys
 from dotenv import load_dotenv
-from src.query_assistant import QueryAssistant
 import json
 
 load_dotenv()
 
 
+def default_socket_path():
+    """Per-user socket path, so other local users can't intercept commands"""
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        runtime_dir = os.path.join(os.path.expanduser('~'), '.mysql_ai')
+    return os.path.join(runtime_dir, 'mysql_ai.sock')
+
+
+DEFAULT_SOCKET = os.getenv('MYSQL_AI_SOCKET') or default_socket_path()
+
+# Separates a served command's output from its exit status
+_STATUS_MARKER = b'\0'
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
         description='AI-Powered MySQL Assistant CLI'
     )
+    parser.add_argument(
+        '--socket',
+        default=DEFAULT_SOCKET,
+        help='UNIX socket of a running "serve" process'
+    )
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
     # Query command
@@ -32,6 +54,12 @@ def main():
     # Docs command
     docs_parser = subparsers.add_parser('docs', help='Generate database documentation')
     
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        'serve',
+        help='Keep an assistant running for other invocations to reuse'
+    )
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -39,56 +67,227 @@ def main():
         parser.print_help()
         sys.exit(1)
     
-    # Initialize assistant
-    assistant = QueryAssistant()
+    if args.command == 'serve':
+        serve(args.socket)
+        return
+    
+    # Hand the command to a running server if there is one
+    status = run_remote(args)
+    if status is not None:
+        sys.exit(status)
+    
+    run_command(create_assistant(), args)
+
+
+def create_assistant():
+    """Initialize assistant"""
+    # Deferred so --help and argument errors skip the heavy imports
+    from src.query_assistant import QueryAssistant
     
-    # Execute command
+    return QueryAssistant()
+
+
+def run_command(assistant, args, out=None):
+    """Execute a parsed command, printing its output to out"""
     if args.command == 'query':
-        result = assistant.ask(args.question)
-        print_query_result(result)
+        print("\n📝 Generated Query:", file=out)
+        streamed_query = print_stream(assistant.ask_stream(args.question), out)
+        result = assistant.ask(args.question, query=streamed_query)
+        print_query_result(
+            result,
+            show_query=result.get('query') != streamed_query.strip(),
+            out=out
+        )
     
     elif args.command == 'optimize':
         result = assistant.optimize_query(args.query)
-        print_optimization_result(result)
+        print_optimization_result(result, out)
     
     elif args.command == 'explain':
-        explanation = assistant.explain_query(args.query)
-        print(f"\n📝 Explanation:\n{explanation}\n")
+        print("\n📝 Explanation:", file=out)
+        print_stream(assistant.explain_query(args.query, stream=True), out)
+        print(file=out)
     
     elif args.command == 'docs':
         docs = assistant.generate_documentation()
-        print(json.dumps(docs, indent=2))
+        print(json.dumps(docs, indent=2), file=out)
+
+
+def run_remote(args):
+    """
+    Send a command to a running server and stream back its output
+    
+    Returns:
+        Exit status of the command, or None if no server is listening
+        on the socket
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    
+    if not _is_own_socket(args.socket):
+        return None
+    
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(args.socket)
+    except OSError:
+        # Missing, stale or another user's socket: run in-process instead
+        client.close()
+        return None
+    
+    status = None
+    with client:
+        client.sendall((json.dumps(vars(args)) + '\n').encode())
+        while status is None:
+            data = client.recv(4096)
+            if not data:
+                break
+            
+            # Output ends with a NUL byte followed by the exit status
+            data, marker, trailer = data.partition(_STATUS_MARKER)
+            if marker:
+                status = trailer
+                while True:
+                    more = client.recv(4096)
+                    if not more:
+                        break
+                    status += more
+            
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+    
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        # Server went away before reporting how the command ended
+        return 1
+
+
+def _is_own_socket(path):
+    """Check that path is a socket created by the current user"""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid()
+
+
+def serve(socket_path):
+    """Serve commands over a UNIX socket with one long-lived assistant"""
+    if os.path.lexists(socket_path) and not _is_own_socket(socket_path):
+        print(f"❌ {socket_path} exists and is not this user's socket")
+        sys.exit(1)
+    
+    os.makedirs(os.path.dirname(socket_path) or '.', mode=0o700, exist_ok=True)
+    
+    assistant = create_assistant()
+    
+    try:
+        asyncio.run(_serve(assistant, socket_path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if _is_own_socket(socket_path):
+            os.unlink(socket_path)
+
+
+async def _serve(assistant, socket_path):
+    """Accept one JSON-encoded command per connection"""
+    loop = asyncio.get_running_loop()
+    
+    async def handle(reader, writer):
+        out = _SocketOutput(loop, writer)
+        status = 0
+        try:
+            request = json.loads(await reader.readline())
+            # Assistant calls block, so run them off the event loop
+            await loop.run_in_executor(
+                None,
+                run_command,
+                assistant,
+                argparse.Namespace(**request),
+                out
+            )
+        except Exception as e:
+            # Already on the loop; queuing through out could land after close
+            writer.write(f"\n❌ Error: {e}\n".encode())
+            status = 1
+        finally:
+            writer.write(_STATUS_MARKER + str(status).encode())
+            await writer.drain()
+            writer.close()
+    
+    if _is_own_socket(socket_path):
+        os.unlink(socket_path)
+    
+    # Create the socket owner-only rather than narrowing it afterwards
+    umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+    finally:
+        os.umask(umask)
+    print(f"🔌 Serving on {socket_path}")
+    
+    async with server:
+        await server.serve_forever()
+
+
+class _SocketOutput:
+    """File-like object forwarding prints from a worker thread to a client"""
+    
+    def __init__(self, loop, writer):
+        self.loop = loop
+        self.writer = writer
+    
+    def write(self, text):
+        self.loop.call_soon_threadsafe(self.writer.write, text.encode())
+        return len(text)
+    
+    def flush(self):
+        pass
+
+
+def print_stream(chunks, out=None):
+    """Print streamed text chunks as they arrive and return the full text"""
+    parts = []
+    for chunk in chunks:
+        print(chunk, end='', flush=True, file=out)
+        parts.append(chunk)
+    print(file=out)
+    return ''.join(parts)
 
 
-def print_query_result(result):
+def print_query_result(result, show_query=True, out=None):
     """Print query result"""
     if result['success']:
-        print(f"\n✅ Success!\n")
-        print(f"📝 Generated Query:\n{result['query']}\n")
-        print(f"📊 Results: {result['row_count']} rows\n")
-        print(result['results'].to_string())
-        print(f"\n💡 Explanation:\n{result['explanation']}\n")
+        print(f"\n✅ Success!\n", file=out)
+        if show_query:
+            print(f"📝 Generated Query:\n{result['query']}\n", file=out)
+        print(f"📊 Results: {result['row_count']} rows\n", file=out)
+        print(result['results'].to_string(), file=out)
+        print(f"\n💡 Explanation:\n{result['explanation']}\n", file=out)
     else:
-        print(f"\n❌ Error: {result['error']}\n")
+        print(f"\n❌ Error: {result['error']}\n", file=out)
 
 
-def print_optimization_result(result):
+def print_optimization_result(result, out=None):
     """Print optimization result"""
-    print(f"\n⚡ Query Optimization\n")
-    print(f"Original Query:\n{result['original_query']}\n")
-    print(f"Optimized Query:\n{result['optimized_query']}\n")
+    print(f"\n⚡ Query Optimization\n", file=out)
+    print(f"Original Query:\n{result['original_query']}\n", file=out)
+    print(f"Optimized Query:\n{result['optimized_query']}\n", file=out)
     
     if result['issues_found']:
-        print("⚠️  Issues Found:")
+        print("⚠️  Issues Found:", file=out)
         for issue in result['issues_found']:
-            print(f"  - {issue['message']}")
-        print()
+            print(f"  - {issue['message']}", file=out)
+        print(file=out)
     
     if result['index_suggestions']:
-        print("📌 Index Suggestions:")
+        print("📌 Index Suggestions:", file=out)
         for suggestion in result['index_suggestions']:
-            print(f"  {suggestion}")
-        print()
+            print(f"  {suggestion}", file=out)
+        print(file=out)
 
 
 if __name__ == '__main__':
@@ -4,10 +4,7 @@ AI-Powered MySQL Assistant Package
 __version__ = '1.0.0'
 __author__ = 'Sandeep Kumar H V'
 
-from .query_assistant import QueryAssistant
-from .query_generator import QueryGenerator
-from .query_optimizer import QueryOptimizer
-from .database_manager import DatabaseManager
+import importlib
 
 __all__ = [
     'QueryAssistant',
@@ -15,3 +12,19 @@ __all__ = [
     'QueryOptimizer',
     'DatabaseManager'
 ]
+
+# Public classes are imported on first access (PEP 562) so that importing
+# the package does not pull in openai, mysql.connector and pandas
+_LAZY_IMPORTS = {
+    'QueryAssistant': '.query_assistant',
+    'QueryGenerator': '.query_generator',
+    'QueryOptimizer': '.query_optimizer',
+    'DatabaseManager': '.database_manager'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,10 +2,18 @@
 AI Service Integration
 Handles communication with AI models (OpenAI/Gemini)
 """
+import asyncio
+import hashlib
+import json
 import logging
 import os
-from typing import Dict, List
-import pandas as pd
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +21,28 @@ logger = logging.getLogger(__name__)
 class AIService:
     """Integrates with AI models for natural language processing"""
     
+    # Output token budgets, sized to typical response lengths
+    SQL_MAX = 150
+    EXPLAIN_MAX = 160
+    RESULT_MAX = 120
+    OPT_MAX = 220
+    DESCRIPTION_MAX = 100
+    
+    # Tables described per prompt when documenting the database
+    DESCRIPTION_BATCH = 50
+    
+    # Columns included in result summaries sent to the model
+    SUMMARY_COLUMNS = 6
+    
+    # Rows from each end and statistics included in result sketches
+    SKETCH_ROWS = 5
+    SKETCH_STATS = ('count', 'unique', 'top', 'mean', 'min', 'max')
+    
+    # Sample values are cut to this many characters in prompts, and
+    # columns averaging more bytes per value than SAMPLE_VALUE_MAX are left out
+    SAMPLE_TEXT_MAX = 64
+    SAMPLE_VALUE_MAX = 1024
+    
     def __init__(self, config: Dict):
         """
         Initialize AI service
@@ -23,6 +53,19 @@ class AIService:
         self.config = config
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.model = config.get('model', 'gpt-4')
+        self.fast_model = config.get('fast_model', 'gpt-4o-mini')
+        self.embedding_model = config.get('embedding_model', 'text-embedding-3-small')
+        
+        # Response cache: in-process LRU, then optional on-disk and
+        # Redis layers (the latter shared by every worker)
+        self.cache_size = config.get('cache_size', 256)
+        self.cache_ttl = config.get('cache_ttl', 86400)
+        self._memory_cache = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._disk_cache = None
+        self._redis = None
+        self._initialize_cache(config.get('cache_dir', '.ai_cache'))
+        self._initialize_redis(config.get('redis_url') or os.getenv('REDIS_URL'))
         
         if not self.api_key:
             logger.warning("No API key found, using mock responses")
@@ -34,8 +77,32 @@ class AIService:
     def _initialize_client(self):
         """Initialize AI client"""
         try:
+            import httpx
             import openai
-            self.client = openai.OpenAI(api_key=self.api_key)
+            
+            # Reuse keep-alive connections and cap how long a call can hang
+            http_client = httpx.Client(
+                timeout=httpx.Timeout(
+                    connect=2.0,
+                    read=self.config.get('ai_timeout', 30.0),
+                    write=5.0,
+                    pool=2.0
+                ),
+                # A custom transport ignores the client's limits=, so
+                # the pool limits are given to the transport itself
+                transport=httpx.HTTPTransport(
+                    retries=2,
+                    limits=httpx.Limits(
+                        max_connections=50,
+                        max_keepalive_connections=20
+                    )
+                )
+            )
+            self.client = openai.OpenAI(
+                api_key=self.api_key,
+                http_client=http_client,
+                max_retries=self.config.get('ai_max_retries', 3)
+            )
             logger.info("OpenAI client initialized")
         except ImportError:
             logger.warning("OpenAI package not found, using mock mode")
@@ -44,38 +111,244 @@ class AIService:
             logger.error(f"Failed to initialize AI client: {e}")
             self.mock_mode = True
     
-    def generate_sql(self, prompt: str) -> str:
+    def _initialize_cache(self, cache_dir: Optional[str]):
+        """Initialize on-disk response cache"""
+        if not cache_dir:
+            return
+        
+        try:
+            import diskcache
+            self._disk_cache = diskcache.Cache(cache_dir)
+            logger.info(f"AI response cache initialized at {cache_dir}")
+        except ImportError:
+            logger.info("diskcache package not found, using in-memory cache only")
+        except Exception as e:
+            logger.error(f"Failed to initialize AI response cache: {e}")
+    
+    def _initialize_redis(self, redis_url: Optional[str]):
+        """Initialize shared Redis response cache"""
+        if not redis_url:
+            return
+        
+        try:
+            import redis
+            client = redis.Redis.from_url(
+                redis_url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5
+            )
+            client.ping()
+            self._redis = client
+            logger.info("Redis AI response cache connected")
+        except ImportError:
+            logger.warning("redis package not found, shared cache disabled")
+        except Exception as e:
+            logger.warning(f"Redis unavailable, shared cache disabled: {e}")
+    
+    def _cache_key(self, model: str, messages: List[Dict], **params) -> str:
+        """Content-addressed key for a chat completion request"""
+        payload = json.dumps([model, messages, params], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached response"""
+        with self._memory_lock:
+            text = self._memory_cache.get(key)
+            if text is not None:
+                self._memory_cache.move_to_end(key)
+                return text
+        
+        if self._disk_cache is not None:
+            text = self._disk_cache.get(key)
+            if text is not None:
+                self._memory_put(key, text)
+                return text
+        
+        if self._redis is not None:
+            try:
+                value = self._redis.get(f"ai:{key}")
+            except Exception as e:
+                logger.warning(f"Redis cache read failed: {e}")
+                value = None
+            
+            if value is not None:
+                text = value.decode()
+                self._memory_put(key, text)
+                if self._disk_cache is not None:
+                    self._disk_cache.set(key, text, expire=self.cache_ttl)
+                return text
+        
+        return None
+    
+    def _cache_set(self, key: str, text: str):
+        """Store a response in the cache"""
+        self._memory_put(key, text)
+        
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, text, expire=self.cache_ttl)
+        
+        if self._redis is not None:
+            try:
+                self._redis.setex(f"ai:{key}", self.cache_ttl, text.encode())
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+    
+    def _memory_put(self, key: str, text: str):
+        """Insert into the in-process LRU, evicting the oldest entry"""
+        if self.cache_size <= 0:
+            return
+        
+        with self._memory_lock:
+            self._memory_cache[key] = text
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > self.cache_size:
+                self._memory_cache.popitem(last=False)
+    
+    def _chat(self, model: str, messages: List[Dict], **params) -> str:
+        """Run a chat completion, serving repeated prompts from cache"""
+        key = self._cache_key(model, messages, **params)
+        
+        text = self._cache_get(key)
+        if text is not None:
+            logger.debug("AI response cache hit")
+            return text
+        
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            **params
+        )
+        text = response.choices[0].message.content.strip()
+        
+        if response.usage:
+            logger.debug(
+                f"{model} used {response.usage.completion_tokens} of "
+                f"{params.get('max_tokens')} completion tokens"
+            )
+        
+        self._cache_set(key, text)
+        return text
+    
+    def _stream_chat(
+        self,
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int
+    ) -> Iterator[str]:
+        """Yield response tokens of a chat completion as they arrive"""
+        key = self._cache_key(
+            model,
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        
+        text = self._cache_get(key)
+        if text is not None:
+            yield text
+            return
+        
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        
+        tokens = []
+        try:
+            for chunk in response:
+                if chunk.choices:
+                    token = chunk.choices[0].delta.content or ""
+                    tokens.append(token)
+                    yield token
+        finally:
+            # Also reached when the consumer stops early, which aborts
+            # the request instead of letting it generate unread tokens
+            close = getattr(response, 'close', None)
+            if close:
+                close()
+        
+        self._cache_set(key, ''.join(tokens).strip())
+    
+    def _guarded_stream(
+        self,
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        fallback: str
+    ) -> Iterator[str]:
+        """Stream a chat completion, yielding fallback text if it fails"""
+        emitted = False
+        try:
+            for token in self._stream_chat(
+                model,
+                messages,
+                temperature,
+                max_tokens
+            ):
+                emitted = True
+                yield token
+        except Exception as e:
+            logger.error(f"Streaming completion failed: {e}")
+            if not emitted:
+                yield fallback
+    
+    def generate_sql(
+        self,
+        system_blocks: List[Dict],
+        user_message: str,
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Generate SQL query from prompt
         
         Args:
-            prompt: Input prompt
+            system_blocks: Static instruction/schema text blocks
+            user_message: Per-request message
+            stream: Return an iterator of response tokens instead of a string
             
         Returns:
-            SQL query string
+            SQL query string, or token iterator when streaming
         """
         if self.mock_mode:
-            return self._mock_sql_generation(prompt)
+            query = self._mock_sql_generation(user_message)
+            return iter([query]) if stream else query
+        
+        # OpenAI caches identical prompt prefixes automatically, so the
+        # blocks are joined into one stable system message and the
+        # Anthropic-style cache_control markers are not sent
+        messages = [
+            {
+                "role": "system",
+                "content": '\n\n'.join(block['text'] for block in system_blocks)
+            },
+            {
+                "role": "user",
+                "content": user_message
+            }
+        ]
+        
+        if stream:
+            return self._guarded_stream(
+                self.model,
+                messages,
+                temperature=0.3,
+                max_tokens=self.SQL_MAX,
+                fallback=self._mock_sql_generation(user_message)
+            )
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert MySQL query generator. Return only SQL queries without explanations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            query = self._chat(
+                self.model,
+                messages,
                 temperature=0.3,
-                max_tokens=500
+                max_tokens=self.SQL_MAX
             )
             
-            query = response.choices[0].message.content.strip()
-            
             # Clean up response
             query = query.replace('```sql', '').replace('```', '').strip()
             
@@ -83,40 +356,55 @@ class AIService:
             
         except Exception as e:
             logger.error(f"AI SQL generation failed: {e}")
-            return self._mock_sql_generation(prompt)
+            return self._mock_sql_generation(user_message)
     
-    def explain_query(self, query: str) -> str:
+    def explain_query(
+        self,
+        query: str,
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Explain SQL query in plain language
         
         Args:
             query: SQL query
+            stream: Return an iterator of response tokens instead of a string
             
         Returns:
-            Plain language explanation
+            Plain language explanation, or token iterator when streaming
         """
         if self.mock_mode:
-            return f"This query retrieves data from the database with specific conditions."
+            explanation = "This query retrieves data from the database with specific conditions."
+            return iter([explanation]) if stream else explanation
+        
+        messages = [
+            {
+                "role": "system",
+                "content": "Explain SQL simply."
+            },
+            {
+                "role": "user",
+                "content": f"Explain this SQL query:\n\n{query}"
+            }
+        ]
+        
+        if stream:
+            return self._guarded_stream(
+                self.fast_model,
+                messages,
+                temperature=0.5,
+                max_tokens=self.EXPLAIN_MAX,
+                fallback="Query explanation unavailable."
+            )
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a database expert. Explain SQL queries in simple language."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Explain this SQL query:\n\n{query}"
-                    }
-                ],
+            return self._chat(
+                self.fast_model,
+                messages,
                 temperature=0.5,
-                max_tokens=300
+                max_tokens=self.EXPLAIN_MAX
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             logger.error(f"Query explanation failed: {e}")
             return "Query explanation unavailable."
@@ -125,8 +413,9 @@ class AIService:
         self,
         question: str,
         query: str,
-        results: pd.DataFrame
-    ) -> str:
+        results: 'pd.DataFrame',
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Generate explanation of query results
         
@@ -134,12 +423,16 @@ class AIService:
             question: Original question
             query: SQL query executed
             results: Query results
+            stream: Return an iterator of response tokens instead of a string
             
         Returns:
-            Natural language explanation
+            Natural language explanation, or token iterator when streaming
         """
         if self.mock_mode:
-            return f"Found {len(results)} results matching your criteria."
+            explanation = f"Found {len(results)} results matching your criteria."
+            return iter([explanation]) if stream else explanation
+        
+        fallback = f"Query returned {len(results)} rows."
         
         try:
             results_summary = self._summarize_results(results)
@@ -153,34 +446,94 @@ Results Summary:
 
 Provide a clear, concise explanation of these results in 2-3 sentences."""
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a data analyst. Explain query results clearly."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            messages = [
+                {
+                    "role": "system",
+                    "content": "Explain query results clearly."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+            
+            if stream:
+                return self._guarded_stream(
+                    self.fast_model,
+                    messages,
+                    temperature=0.5,
+                    max_tokens=self.RESULT_MAX,
+                    fallback=fallback
+                )
+            
+            return self._chat(
+                self.fast_model,
+                messages,
                 temperature=0.5,
-                max_tokens=200
+                max_tokens=self.RESULT_MAX
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             logger.error(f"Results explanation failed: {e}")
-            return f"Query returned {len(results)} rows."
+            return iter([fallback]) if stream else fallback
+    
+    async def explain_results_async(
+        self,
+        question: str,
+        query: str,
+        results: 'pd.DataFrame'
+    ) -> str:
+        """
+        Generate explanation of query results without blocking the event loop
+        
+        Args:
+            question: Original question
+            query: SQL query executed
+            results: Query results
+            
+        Returns:
+            Natural language explanation
+        """
+        return await asyncio.to_thread(self.explain_results, question, query, results)
     
-    def explain_dataframe(self, df: pd.DataFrame) -> str:
+    def embed_text(self, text: str) -> Optional[List[float]]:
+        """
+        Get embedding vector for text
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector, or None if unavailable
+        """
+        if self.mock_mode:
+            return None
+        
+        key = self._cache_key(self.embedding_model, [text])
+        cached = self._cache_get(key)
+        if cached is not None:
+            return json.loads(cached)
+        
+        try:
+            response = self.client.embeddings.create(
+                model=self.embedding_model,
+                input=text
+            )
+            embedding = response.data[0].embedding
+            
+            self._cache_set(key, json.dumps(embedding))
+            return embedding
+            
+        except Exception as e:
+            logger.error(f"Text embedding failed: {e}")
+            return None
+    
+    def explain_dataframe(self, df: Union['pd.DataFrame', 'pa.Table']) -> str:
         """
         Explain DataFrame contents
         
         Args:
-            df: DataFrame to explain
+            df: DataFrame or Arrow table to explain
             
         Returns:
             Explanation text
@@ -192,8 +545,9 @@ Provide a clear, concise explanation of these results in 2-3 sentences."""
         self,
         query: str,
         execution_plan: List[Dict],
-        issues: List[Dict]
-    ) -> str:
+        issues: List[Dict],
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Get AI recommendations for query optimization
         
@@ -201,42 +555,53 @@ Provide a clear, concise explanation of these results in 2-3 sentences."""
             query: SQL query
             execution_plan: Query execution plan
             issues: Identified issues
+            stream: Return an iterator of response tokens instead of a string
             
         Returns:
-            Optimization advice
+            Optimization advice, or token iterator when streaming
         """
         if self.mock_mode:
-            return "Consider adding indexes and avoiding table scans."
+            advice = "Consider adding indexes and avoiding table scans."
+            return iter([advice]) if stream else advice
         
-        try:
-            issues_text = '\n'.join([
-                f"- {issue['message']}" for issue in issues
-            ])
-            
-            prompt = f"""Query: {query}
+        issues_text = '\n'.join([
+            f"- {issue['message']}" for issue in issues
+        ])
+        
+        prompt = f"""Query: {query}
 
 Issues Found:
 {issues_text}
 
 Provide 3 specific recommendations to optimize this query."""
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a database performance expert."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+        
+        messages = [
+            {
+                "role": "system",
+                "content": "MySQL performance expert."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        
+        if stream:
+            return self._guarded_stream(
+                self.fast_model,
+                messages,
                 temperature=0.5,
-                max_tokens=300
+                max_tokens=self.OPT_MAX,
+                fallback="Optimization advice unavailable."
+            )
+        
+        try:
+            return self._chat(
+                self.fast_model,
+                messages,
+                temperature=0.5,
+                max_tokens=self.OPT_MAX
             )
-            
-            return response.choices[0].message.content.strip()
             
         except Exception as e:
             logger.error(f"Optimization advice failed: {e}")
@@ -268,29 +633,92 @@ Columns: {columns}
 Write a 1-2 sentence description of what this table likely stores."""
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            return self._chat(
+                self.fast_model,
+                [
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
                 temperature=0.5,
-                max_tokens=100
+                max_tokens=self.DESCRIPTION_MAX
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             logger.error(f"Table description generation failed: {e}")
             return f"Table: {table_name}"
     
+    def generate_table_descriptions(
+        self,
+        table_schemas: Dict[str, List[Dict]]
+    ) -> Dict[str, str]:
+        """
+        Generate descriptions for many tables with batched prompts
+        
+        Args:
+            table_schemas: Mapping of table name to table schema
+            
+        Returns:
+            Mapping of table name to description text
+        """
+        if self.mock_mode:
+            return {
+                table_name: f"Table {table_name} stores related data."
+                for table_name in table_schemas
+            }
+        
+        descriptions = {
+            table_name: f"Table: {table_name}"
+            for table_name in table_schemas
+        }
+        
+        table_names = list(table_schemas)
+        for start in range(0, len(table_names), self.DESCRIPTION_BATCH):
+            batch = table_names[start:start + self.DESCRIPTION_BATCH]
+            
+            tables_text = '\n'.join([
+                f"{table_name}: {', '.join([col['Field'] for col in table_schemas[table_name]])}"
+                for table_name in batch
+            ])
+            
+            prompt = f"""Tables and their columns:
+{tables_text}
+
+Return a JSON object mapping each table name to a 1-2 sentence description of what the table likely stores."""
+            
+            try:
+                response = self._chat(
+                    self.fast_model,
+                    [
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.5,
+                    max_tokens=self.DESCRIPTION_MAX * len(batch)
+                )
+                
+                response = response.replace('```json', '').replace('```', '').strip()
+                parsed = json.loads(response)
+                
+                descriptions.update({
+                    table_name: str(parsed[table_name])
+                    for table_name in batch
+                    if table_name in parsed
+                })
+                
+            except Exception as e:
+                logger.error(f"Table descriptions generation failed: {e}")
+        
+        return descriptions
+    
     def generate_insights(
         self,
         table_name: str,
         stats: Dict,
-        sample_data: pd.DataFrame
+        sample_data: 'pd.DataFrame'
     ) -> Dict:
         """
         Generate AI-powered insights about a table
@@ -310,15 +738,118 @@ Write a 1-2 sentence description of what this table likely stores."""
             'sample_rows': len(sample_data)
         }
     
-    def _summarize_results(self, df: pd.DataFrame) -> str:
-        """Create summary of DataFrame"""
-        summary = f"Rows: {len(df)}, Columns: {len(df.columns)}\n"
-        summary += f"Columns: {', '.join(df.columns.tolist())}\n"
+    def _summarize_results(self, df: Union['pd.DataFrame', 'pa.Table']) -> str:
+        """
+        Create a JSON statistical sketch of a result set for prompts
+        
+        The sketch holds the shape, dtypes, per-column statistics and the
+        first and last few rows, bounded to the first few columns, so its
+        size does not grow with the number of rows. Arrow tables are
+        accepted too; only the summarized columns are converted to pandas.
+        """
+        if hasattr(df, 'num_columns'):
+            column_count = df.num_columns
+            preview = df.select(df.column_names[:self.SUMMARY_COLUMNS]).to_pandas()
+        else:
+            column_count = len(df.columns)
+            preview = df.iloc[:, :self.SUMMARY_COLUMNS]
+        
+        # Joins can repeat labels (o.id, c.id); JSON output needs them unique
+        preview = preview.set_axis(self._unique_labels(preview.columns), axis=1)
+        
+        sketch = {
+            'shape': [len(df), column_count],
+            'dtypes': {str(col): str(dtype) for col, dtype in preview.dtypes.items()}
+        }
         
         if len(df) > 0:
-            summary += f"First row preview: {df.iloc[0].to_dict()}"
+            head = self._compact_sample(preview.head(self.SKETCH_ROWS))
+            
+            # Nothing left to describe if every column was binary or oversized
+            if len(head.columns) == 0:
+                return json.dumps(sketch, default=str)
+            
+            # Statistics only for the columns that survive compaction
+            stats = preview[head.columns].describe(include='all', percentiles=[])
+            stats = stats.loc[stats.index.isin(self.SKETCH_STATS)]
+            sketch['describe'] = {
+                column: {name: value for name, value in values.items() if value is not None}
+                for column, values in self._to_records(stats, orient='columns').items()
+            }
+            
+            sketch['head'] = self._to_records(head)
+            if len(df) > self.SKETCH_ROWS:
+                tail = preview[head.columns].tail(self.SKETCH_ROWS)
+                sketch['tail'] = self._to_records(self._compact_sample(tail))
+        
+        return json.dumps(sketch, default=str)
+    
+    @staticmethod
+    def _unique_labels(columns) -> List[str]:
+        """Suffix repeated column labels: id, id -> id, id_2"""
+        labels = []
+        for column in map(str, columns):
+            label, n = column, 1
+            while label in labels:
+                n += 1
+                label = f"{column}_{n}"
+            labels.append(label)
+        return labels
+    
+    def _to_records(self, df: 'pd.DataFrame', orient: str = 'records'):
+        """JSON-compatible rows of a DataFrame with long text truncated"""
+        records = json.loads(
+            df.to_json(orient=orient, date_format='iso', default_handler=str)
+        )
+        
+        def truncate(value):
+            if isinstance(value, dict):
+                return {key: truncate(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [truncate(item) for item in value]
+            if isinstance(value, str):
+                return value[:self.SAMPLE_TEXT_MAX]
+            return value
+        
+        return truncate(records)
+    
+    def _compact_sample(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Shrink sample rows before they are serialized into a prompt
+        
+        Binary and oversized columns (BLOBs, large JSON) are dropped and
+        remaining text values are truncated to SAMPLE_TEXT_MAX characters.
+        """
+        kept = []
+        compact = {}
+        
+        # By position, since joins can return duplicate column labels
+        for position in range(df.shape[1]):
+            values = df.iloc[:, position]
+            
+            # Numbers, booleans and datetimes are already short
+            if values.dtype.kind in 'biufcmM':
+                kept.append(position)
+                compact[position] = values
+                continue
+            
+            present = values.dropna()
+            if present.map(lambda v: isinstance(v, (bytes, bytearray))).any():
+                continue
+            
+            text = present.astype(str)
+            if len(text) and text.str.len().mean() > self.SAMPLE_VALUE_MAX:
+                continue
+            
+            kept.append(position)
+            compact[position] = values.where(
+                values.isna(),
+                values.astype(str).str.slice(0, self.SAMPLE_TEXT_MAX)
+            )
         
-        return summary
+        result = df.__class__(compact, index=df.index)
+        result.columns = df.columns[kept]
+        return result
     
     def _mock_sql_generation(self, prompt: str) -> str:
         """Generate mock SQL for testing"""
@@ -334,5 +865,7 @@ Write a 1-2 sentence description of what this table likely stores."""
         return {
             'status': 'healthy' if not self.mock_mode else 'mock_mode',
             'model': self.model,
+            'fast_model': self.fast_model,
+            'embedding_model': self.embedding_model,
             'mock_mode': self.mock_mode
         }
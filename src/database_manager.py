@@ -2,11 +2,18 @@
 MySQL Database Manager
 Handles all database operations
 """
+import asyncio
+import json
 import logging
+import threading
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
 import mysql.connector
 from mysql.connector import pooling
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import pandas as pd
+import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +29,12 @@ class DatabaseManager:
             config: Database configuration
         """
         self.config = config
+        self.pool_size = config.get('pool_size', 10)
+        self.fetch_batch_size = config.get('fetch_batch_size', 10000)
         self.pool = None
+        
+        # The pool raises when exhausted; this makes callers wait instead
+        self._checkout = threading.BoundedSemaphore(self.pool_size)
         self._initialize_pool()
     
     def _initialize_pool(self):
@@ -30,7 +42,7 @@ class DatabaseManager:
         try:
             self.pool = pooling.MySQLConnectionPool(
                 pool_name="mysql_pool",
-                pool_size=5,
+                pool_size=self.pool_size,
                 host=self.config.get('host', 'localhost'),
                 port=self.config.get('port', 3306),
                 user=self.config.get('user', 'root'),
@@ -53,22 +65,93 @@ class DatabaseManager:
         Returns:
             DataFrame with results
         """
-        connection = None
-        try:
-            connection = self.pool.get_connection()
+        return self.execute_query_arrow(query, params).to_pandas()
+    
+    def execute_query_arrow(self, query: str, params: tuple = None) -> pa.Table:
+        """
+        Execute SQL query and return results as a columnar Arrow table
+        
+        Cheaper than execute_query() for callers that only read a few
+        columns or summarize column-wise, since no DataFrame is built.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
             
-            # Execute query
-            df = pd.read_sql_query(query, connection, params=params)
+        Returns:
+            Arrow table with results
+        """
+        try:
+            with self.cursor() as cursor:
+                # Execute query
+                cursor.execute(query, params)
+                table = self._fetch_table(cursor)
             
-            logger.info(f"Query executed successfully, returned {len(df)} rows")
-            return df
+            logger.info(f"Query executed successfully, returned {table.num_rows} rows")
+            return table
             
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise
-        finally:
-            if connection:
-                connection.close()
+    
+    async def execute_query_async(self, query: str, params: tuple = None) -> pd.DataFrame:
+        """
+        Execute SQL query on a worker thread
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
+            
+        Returns:
+            DataFrame with results
+        """
+        return await asyncio.to_thread(self.execute_query, query, params)
+    
+    def _fetch_table(self, cursor) -> pa.Table:
+        """
+        Materialize cursor results column-wise into Arrow
+        
+        Rows are fetched in batches and transposed into per-column value
+        lists, so each column is converted to an Arrow array in one pass
+        instead of pandas re-inferring dtypes cell by cell.
+        """
+        if cursor.description is None:
+            return pa.table({})
+        
+        names = [column[0] for column in cursor.description]
+        columns = [[] for _ in names]
+        
+        while True:
+            rows = cursor.fetchmany(self.fetch_batch_size)
+            if not rows:
+                break
+            for values, batch_values in zip(columns, zip(*rows)):
+                values.extend(batch_values)
+        
+        return pa.Table.from_arrays(
+            [self._to_arrow_array(values) for values in columns],
+            names=names
+        )
+    
+    @staticmethod
+    def _to_arrow_array(values: List) -> pa.Array:
+        """Convert a column of driver values, falling back to strings"""
+        try:
+            array = pa.array(values)
+            # DECIMAL columns stay float64, as with pd.read_sql_query
+            if pa.types.is_decimal(array.type):
+                array = array.cast(pa.float64())
+            return array
+        except OverflowError:
+            # BIGINT UNSIGNED values above the int64 range
+            try:
+                return pa.array(values, type=pa.uint64())
+            except (OverflowError, pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+        
+        return pa.array([None if v is None else str(v) for v in values])
     
     def explain_query(self, query: str) -> List[Dict]:
         """
@@ -80,45 +163,93 @@ class DatabaseManager:
         Returns:
             List of execution plan steps
         """
-        connection = None
         try:
-            connection = self.pool.get_connection()
-            cursor = connection.cursor(dictionary=True)
-            
-            # Get execution plan
-            cursor.execute(f"EXPLAIN {query}")
-            plan = cursor.fetchall()
-            
-            cursor.close()
-            return plan
+            with self.session() as cursor:
+                # Get execution plan
+                cursor.execute(f"EXPLAIN {query}")
+                return cursor.fetchall()
             
         except Exception as e:
             logger.error(f"EXPLAIN failed: {e}")
             return []
-        finally:
-            if connection:
-                connection.close()
+    
+    def validate_query(self, query: str) -> Dict:
+        """
+        Check that MySQL can parse and plan a query
+        
+        Uses EXPLAIN FORMAT=JSON, which returns the whole plan as a single
+        row, and unlike explain_query() lets errors propagate.
+        
+        Args:
+            query: SQL query
+            
+        Returns:
+            Parsed JSON execution plan
+            
+        Raises:
+            mysql.connector.Error: If the query is invalid
+        """
+        with self.cursor() as cursor:
+            cursor.execute(f"EXPLAIN FORMAT=JSON {query}")
+            return json.loads(cursor.fetchone()[0])
+    
+    async def explain_query_async(self, query: str) -> List[Dict]:
+        """
+        Get query execution plan on a worker thread
+        
+        Args:
+            query: SQL query
+            
+        Returns:
+            List of execution plan steps
+        """
+        return await asyncio.to_thread(self.explain_query, query)
     
     def get_tables(self) -> List[str]:
         """Get list of all tables"""
-        connection = None
         try:
-            connection = self.pool.get_connection()
-            cursor = connection.cursor()
-            
-            cursor.execute("SHOW TABLES")
-            tables = [row[0] for row in cursor.fetchall()]
-            
-            cursor.close()
-            return tables
+            with self.cursor() as cursor:
+                cursor.execute("SHOW TABLES")
+                return [row[0] for row in cursor.fetchall()]
             
         except Exception as e:
             logger.error(f"Failed to get tables: {e}")
             return []
-        finally:
-            if connection:
+    
+    @contextmanager
+    def cursor(self, dictionary: bool = False) -> Iterator:
+        """
+        Check out a pooled connection for one or more statements
+        
+        Blocks while every pooled connection is in use rather than
+        failing, so threaded and async callers can share the pool.
+        
+        Args:
+            dictionary: Return rows as dictionaries
+            
+        Yields:
+            Cursor, closed and its connection returned to the pool on exit
+        """
+        with self._checkout:
+            connection = self.pool.get_connection()
+            try:
+                cursor = connection.cursor(dictionary=dictionary)
+                try:
+                    yield cursor
+                finally:
+                    cursor.close()
+            finally:
                 connection.close()
     
+    def session(self):
+        """
+        Run several statements on one pooled connection
+        
+        Returns:
+            Context manager yielding a dictionary cursor
+        """
+        return self.cursor(dictionary=True)
+    
     def get_table_schema(self, table_name: str) -> List[Dict]:
         """
         Get schema information for a table
@@ -129,68 +260,144 @@ class DatabaseManager:
         Returns:
             List of column information
         """
-        connection = None
         try:
-            connection = self.pool.get_connection()
-            cursor = connection.cursor(dictionary=True)
-            
-            cursor.execute(f"DESCRIBE {table_name}")
-            schema = cursor.fetchall()
-            
-            cursor.close()
-            return schema
+            with self.session() as cursor:
+                return self._describe(cursor, table_name)
             
         except Exception as e:
             logger.error(f"Failed to get schema for {table_name}: {e}")
             return []
-        finally:
-            if connection:
-                connection.close()
+    
+    def get_all_schemas(self) -> Dict[str, List[Dict]]:
+        """
+        Get column information for every table in one round-trip
+        
+        Returns:
+            Mapping of table name to DESCRIBE-style column rows
+        """
+        try:
+            with self.session() as cursor:
+                cursor.execute("""
+                    SELECT
+                        table_name as table_name,
+                        column_name as `Field`,
+                        column_type as `Type`,
+                        is_nullable as `Null`,
+                        column_key as `Key`,
+                        column_default as `Default`,
+                        extra as `Extra`
+                    FROM information_schema.COLUMNS
+                    WHERE table_schema = DATABASE()
+                    ORDER BY table_name, ordinal_position
+                """)
+                rows = cursor.fetchall()
+            
+            schemas = {}
+            for table_name, columns in groupby(rows, key=itemgetter('table_name')):
+                schemas[table_name] = [
+                    {key: value for key, value in column.items() if key != 'table_name'}
+                    for column in columns
+                ]
+            
+            return schemas
+            
+        except Exception as e:
+            logger.error(f"Failed to get schemas: {e}")
+            return {}
     
     def get_table_statistics(self, table_name: str) -> Dict:
         """
         Get statistics for a table
         
+        The row count is InnoDB's estimate from information_schema, which
+        avoids a full index scan; use get_exact_row_count() when an exact
+        figure is needed.
+        
         Args:
             table_name: Name of the table
             
         Returns:
             Dictionary of statistics
         """
-        connection = None
         try:
-            connection = self.pool.get_connection()
-            cursor = connection.cursor(dictionary=True)
+            with self.session() as cursor:
+                return self._table_statistics(cursor, table_name)
             
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) as count FROM {table_name}")
-            row_count = cursor.fetchone()['count']
+        except Exception as e:
+            logger.error(f"Failed to get statistics for {table_name}: {e}")
+            return {}
+    
+    def get_schema_stats(self, table_name: str) -> Tuple[List[Dict], Dict]:
+        """
+        Get schema and statistics for a table over a single connection
+        
+        Args:
+            table_name: Name of the table
             
-            # Get table size
-            cursor.execute(f"""
-                SELECT 
-                    table_name,
-                    ROUND(((data_length + index_length) / 1024 / 1024), 2) as size_mb
-                FROM information_schema.TABLES
-                WHERE table_schema = DATABASE()
-                AND table_name = '{table_name}'
-            """)
-            size_info = cursor.fetchone()
+        Returns:
+            (schema, statistics)
+        """
+        try:
+            with self.session() as cursor:
+                schema = self._describe(cursor, table_name)
+                stats = self._table_statistics(cursor, table_name)
+                return schema, stats
             
-            cursor.close()
+        except Exception as e:
+            logger.error(f"Failed to get schema and statistics for {table_name}: {e}")
+            return [], {}
+    
+    def _describe(self, cursor, table_name: str) -> List[Dict]:
+        """Fetch column information for a table"""
+        cursor.execute(f"DESCRIBE {self.quote_identifier(table_name)}")
+        return cursor.fetchall()
+    
+    def _table_statistics(self, cursor, table_name: str) -> Dict:
+        """Fetch estimated row count and size for a table"""
+        cursor.execute("""
+            SELECT 
+                table_rows as row_count,
+                ROUND(((data_length + index_length) / 1024 / 1024), 2) as size_mb
+            FROM information_schema.TABLES
+            WHERE table_schema = DATABASE()
+            AND table_name = %s
+        """, (table_name,))
+        rows = cursor.fetchall()
+        
+        if not rows:
+            return {}
+        
+        return {
+            'table_name': table_name,
+            'row_count': rows[0]['row_count'] or 0,
+            'size_mb': rows[0]['size_mb'] or 0
+        }
+    
+    def get_exact_row_count(self, table_name: str) -> int:
+        """
+        Count rows in a table exactly
+        
+        Args:
+            table_name: Name of the table
             
-            return {
-                'table_name': table_name,
-                'row_count': row_count,
-                'size_mb': size_info['size_mb'] if size_info else 0
-            }
+        Returns:
+            Number of rows
+        """
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {self.quote_identifier(table_name)}"
+                )
+                return cursor.fetchone()[0]
             
         except Exception as e:
-            logger.error(f"Failed to get statistics for {table_name}: {e}")
-            return {}
-        finally:
-            if connection:
-                connection.close()
+            logger.error(f"Failed to count rows for {table_name}: {e}")
+            raise
+    
+    @staticmethod
+    def quote_identifier(name: str) -> str:
+        """Quote a table or column name for interpolation into SQL"""
+        return '`' + name.replace('`', '``') + '`'
     
     def health_check(self) -> Dict:
         """
@@ -200,14 +407,9 @@ class DatabaseManager:
             Health check results
         """
         try:
-            connection = self.pool.get_connection()
-            cursor = connection.cursor()
-            
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-            
-            cursor.close()
-            connection.close()
+            with self.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
             
             return {
                 'status': 'healthy',
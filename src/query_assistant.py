@@ -1,19 +1,28 @@
 """
 Main Query Assistant - Orchestrates AI and MySQL operations
 """
+import asyncio
+import copy
 import logging
-from typing import Dict, List, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Union
 import pandas as pd
+import pyarrow as pa
 
 from .query_generator import QueryGenerator
 from .query_optimizer import QueryOptimizer
 from .database_manager import DatabaseManager
 from .ai_service import AIService
 from .schema_analyzer import SchemaAnalyzer
+from .semantic_cache import SemanticCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_RE_SELECT = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+_RE_LIMIT = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+
 
 class QueryAssistant:
     """
@@ -29,6 +38,7 @@ class QueryAssistant:
             config: Configuration dictionary
         """
         self.config = config or {}
+        self.result_limit = self.config.get('result_limit', 1000)
         
         # Initialize components
         self.db_manager = DatabaseManager(self.config)
@@ -41,57 +51,118 @@ class QueryAssistant:
             self.db_manager,
             self.ai_service
         )
-        self.schema_analyzer = SchemaAnalyzer(self.db_manager)
+        self.schema_analyzer = SchemaAnalyzer(
+            self.db_manager,
+            max_workers=min(
+                self.config.get('max_schema_workers', 16),
+                self.db_manager.pool_size
+            ),
+            load_timeout=self.config.get('schema_load_timeout', 30.0)
+        )
+        
+        # Load the schema now so the first question doesn't wait for it
+        if self.config.get('warm_schema', True):
+            self.schema_analyzer.warm()
+        
+        # Answers reused for paraphrased questions
+        self.semantic_cache = SemanticCache(
+            maxlen=self.config.get('semantic_cache_size', 256),
+            threshold=self.config.get('semantic_cache_threshold', 0.95),
+            ttl=self.config.get('semantic_cache_ttl', 300)
+        )
+        
+        # Worker threads for overlapping independent DB/AI round-trips
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.get('max_workers', 4)
+        )
         
         logger.info("Query Assistant initialized successfully")
     
-    def ask(self, question: str) -> Dict:
+    def ask(self, question: str, query: Optional[str] = None) -> Dict:
+        """
+        Ask a question in natural language and get results
+        
+        Synchronous wrapper around ask_async(); call that directly from
+        code already running an event loop.
+        
+        Args:
+            question: Natural language question
+            query: SQL already streamed by ask_stream(), skips generation
+            
+        Returns:
+            Dictionary containing query, results, and explanation
+        """
+        return asyncio.run(self.ask_async(question, query=query))
+    
+    async def ask_async(self, question: str, query: Optional[str] = None) -> Dict:
         """
         Ask a question in natural language and get results
         
+        The AI explanation and the EXPLAIN-based analysis are independent,
+        so they run concurrently once the query has executed.
+        
         Args:
             question: Natural language question
+            query: SQL already streamed by ask_stream(), skips generation
             
         Returns:
             Dictionary containing query, results, and explanation
         """
         logger.info(f"Processing question: {question}")
         
+        embedding, cached = await asyncio.to_thread(self._semantic_lookup, question)
+        if cached is not None:
+            # A copy, so callers can't modify the cached results frame
+            return {**copy.deepcopy(cached), 'question': question, 'cached': True}
+        
         try:
             # Get database schema context
-            schema_context = self.schema_analyzer.get_schema_context()
+            schema_context = await asyncio.to_thread(
+                self.schema_analyzer.get_formatted_schema
+            )
             
             # Generate SQL query
-            query = self.query_generator.generate(
-                question,
-                schema_context
-            )
+            if query is None:
+                query = await asyncio.to_thread(
+                    self.query_generator.generate,
+                    question,
+                    schema_context
+                )
+            else:
+                query = await asyncio.to_thread(
+                    self.query_generator.finalize,
+                    query,
+                    schema_context
+                )
+            
+            query = self._apply_result_limit(query)
             
             logger.info(f"Generated query: {query}")
             
             # Execute query
-            results = self.db_manager.execute_query(query)
+            results = await self.db_manager.execute_query_async(query)
             
-            # Get AI explanation
-            explanation = self.ai_service.explain_results(
-                question,
-                query,
-                results
+            # Get AI explanation and optimization suggestions concurrently
+            explanation, optimization = await asyncio.gather(
+                self.ai_service.explain_results_async(question, query, results),
+                self.query_optimizer.analyze_async(query)
             )
             
-            # Get optimization suggestions
-            optimization = self.query_optimizer.analyze(query)
-            
-            return {
+            result = {
                 'success': True,
                 'question': question,
                 'query': query,
                 'results': results,
                 'explanation': explanation,
                 'optimization': optimization,
-                'row_count': len(results) if results else 0
+                'row_count': len(results)
             }
             
+            if embedding is not None:
+                self.semantic_cache.insert(embedding, copy.deepcopy(result))
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error processing question: {e}")
             return {
@@ -100,6 +171,54 @@ class QueryAssistant:
                 'question': question
             }
     
+    def _apply_result_limit(self, query: str) -> str:
+        """Append a LIMIT to generated SELECT queries that have none"""
+        if not self.result_limit:
+            return query
+        
+        if not _RE_SELECT.match(query) or _RE_LIMIT.search(query):
+            return query
+        
+        # New line so a trailing comment cannot swallow the clause
+        return f"{query.rstrip().rstrip(';').rstrip()}\nLIMIT {self.result_limit}"
+    
+    def ask_stream(self, question: str) -> Iterator[str]:
+        """
+        Stream the SQL query generated for a question
+        
+        Accumulate the chunks and pass them to ask(question, query=...)
+        to validate, execute and explain the query.
+        
+        Args:
+            question: Natural language question
+            
+        Returns:
+            Iterator of SQL text chunks
+        """
+        # A cached answer streams its query at once; ask() then reuses it
+        _, cached = self._semantic_lookup(question)
+        if cached is not None:
+            return iter([cached['query']])
+        
+        schema_context = self.schema_analyzer.get_formatted_schema()
+        return self.query_generator.generate_stream(question, schema_context)
+    
+    def _semantic_lookup(self, question: str) -> tuple:
+        """
+        Look up an answer to a similar earlier question
+        
+        Returns:
+            (question embedding or None, cached result or None)
+        """
+        if self.semantic_cache.maxlen <= 0:
+            return None, None
+        
+        embedding = self.ai_service.embed_text(question)
+        if embedding is None:
+            return None, None
+        
+        return embedding, self.semantic_cache.lookup(embedding)
+    
     def generate_query(self, description: str) -> str:
         """
         Generate SQL query from natural language description
@@ -110,7 +229,7 @@ class QueryAssistant:
         Returns:
             SQL query string
         """
-        schema_context = self.schema_analyzer.get_schema_context()
+        schema_context = self.schema_analyzer.get_formatted_schema()
         return self.query_generator.generate(description, schema_context)
     
     def execute_query(self, query: str) -> pd.DataFrame:
@@ -125,6 +244,18 @@ class QueryAssistant:
         """
         return self.db_manager.execute_query(query)
     
+    def execute_query_arrow(self, query: str) -> pa.Table:
+        """
+        Execute SQL query and return columnar results
+        
+        Args:
+            query: SQL query string
+            
+        Returns:
+            Arrow table with results
+        """
+        return self.db_manager.execute_query_arrow(query)
+    
     def optimize_query(self, query: str) -> Dict:
         """
         Optimize existing SQL query
@@ -137,24 +268,29 @@ class QueryAssistant:
         """
         return self.query_optimizer.optimize(query)
     
-    def explain_query(self, query: str) -> str:
+    def explain_query(
+        self,
+        query: str,
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Explain SQL query in plain language
         
         Args:
             query: SQL query to explain
+            stream: Return an iterator of explanation chunks
             
         Returns:
             Plain language explanation
         """
-        return self.ai_service.explain_query(query)
+        return self.ai_service.explain_query(query, stream=stream)
     
-    def explain_results(self, results: pd.DataFrame) -> str:
+    def explain_results(self, results: Union[pd.DataFrame, pa.Table]) -> str:
         """
         Generate AI explanation of query results
         
         Args:
-            results: Query results DataFrame
+            results: Query results DataFrame or Arrow table
             
         Returns:
             AI-generated explanation
@@ -170,22 +306,19 @@ class QueryAssistant:
         """
         logger.info("Generating database documentation")
         
-        schema = self.schema_analyzer.analyze_schema()
+        # One catalog query and one AI call cover every table
+        table_schemas = self.db_manager.get_all_schemas()
+        schema = self.schema_analyzer.build_schema(table_schemas)
         relationships = self.schema_analyzer.find_relationships()
         
         # Use AI to generate descriptions
         documentation = {
             'schema': schema,
             'relationships': relationships,
-            'descriptions': {}
-        }
-        
-        for table_name in schema['tables']:
-            description = self.ai_service.generate_table_description(
-                table_name,
-                schema['tables'][table_name]
+            'descriptions': self.ai_service.generate_table_descriptions(
+                table_schemas
             )
-            documentation['descriptions'][table_name] = description
+        }
         
         return documentation
     
@@ -199,22 +332,40 @@ class QueryAssistant:
         Returns:
             Dictionary of insights
         """
-        # Get table statistics
-        stats = self.db_manager.get_table_statistics(table_name)
+        return self.analyze_table(table_name)['insights']
+    
+    def analyze_table(self, table_name: str) -> Dict:
+        """
+        Get schema, statistics and AI insights for a table
+        
+        Schema and statistics share one pooled connection while the
+        sample data query runs concurrently on another.
         
-        # Get sample data
-        sample_data = self.db_manager.execute_query(
-            f"SELECT * FROM {table_name} LIMIT 100"
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Dictionary with schema, stats and insights
+        """
+        sample_future = self.executor.submit(
+            self.db_manager.execute_query,
+            f"SELECT * FROM {self.db_manager.quote_identifier(table_name)} LIMIT 100"
         )
         
+        schema, stats = self.db_manager.get_schema_stats(table_name)
+        
         # Generate AI insights
         insights = self.ai_service.generate_insights(
             table_name,
             stats,
-            sample_data
+            sample_future.result()
         )
         
-        return insights
+        return {
+            'schema': schema,
+            'stats': stats,
+            'insights': insights
+        }
     
     def suggest_indexes(self, query: str) -> List[str]:
         """
@@ -228,6 +379,16 @@ class QueryAssistant:
         """
         return self.query_optimizer.suggest_indexes(query)
     
+    def refresh_schema(self):
+        """
+        Forget cached schema, query analyses and answers
+        
+        Call after the database schema changes.
+        """
+        self.schema_analyzer.clear_cache()
+        self.query_optimizer.clear_cache()
+        self.semantic_cache.clear()
+    
     def health_check(self) -> Dict:
         """
         Check health of database and assistant
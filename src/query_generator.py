@@ -3,10 +3,14 @@ Natural Language to SQL Query Generator
 Uses AI to convert natural language to SQL
 """
 import logging
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Streamed SQL is abandoned as soon as it starts with one of these
+_WRITE_PREFIXES = ('DROP', 'DELETE', 'TRUNC', 'UPDATE', 'INSERT')
+_PREFIX_CHARS = 6
+
 
 class QueryGenerator:
     """Generates SQL queries from natural language"""
@@ -21,14 +25,33 @@ class QueryGenerator:
         """
         self.ai_service = ai_service
         self.db_manager = db_manager
+        
+        # Constant prompt parts, built once rather than per request
+        self._instructions_block = {
+            "type": "text",
+            "text": """You are an expert MySQL query generator.
+
+Generate a MySQL query that:
+1. Answers the user's request accurately
+2. Uses proper MySQL syntax
+3. Follows best practices (proper joins, WHERE clauses, etc.)
+4. Includes appropriate LIMIT clauses if needed
+5. Returns only the SQL query, no explanations"""
+        }
+        self._request_prefix = "User Request: "
+        self._request_suffix = "\n\nSQL Query:"
+        
+        # (schema, system blocks) for the most recent schema, which is
+        # memoized upstream; one tuple so threads never see a mixed pair
+        self._blocks_cache: Tuple[Optional[str], List[Dict]] = (None, [])
     
-    def generate(self, description: str, schema_context: Dict) -> str:
+    def generate(self, description: str, schema_context: str) -> str:
         """
         Generate SQL query from natural language
         
         Args:
             description: Natural language description
-            schema_context: Database schema information
+            schema_context: Formatted database schema
             
         Returns:
             SQL query string
@@ -36,10 +59,93 @@ class QueryGenerator:
         logger.info(f"Generating query for: {description}")
         
         # Create prompt for AI
-        prompt = self._create_prompt(description, schema_context)
+        system_blocks, user_message = self._create_prompt(
+            description,
+            schema_context
+        )
+        
+        # Stream SQL from AI so a data-modifying answer is cut short
+        chunks = self.ai_service.generate_sql(
+            system_blocks,
+            user_message,
+            stream=True
+        )
+        query = ''.join(self._stop_on_write(chunks))
+        
+        return self.finalize(query, schema_context)
+    
+    def generate_stream(self, description: str, schema_context: str) -> Iterator[str]:
+        """
+        Stream SQL query tokens from natural language
+        
+        The streamed text is unvalidated; pass the accumulated text
+        to finalize() before executing it.
+        
+        Args:
+            description: Natural language description
+            schema_context: Formatted database schema
+            
+        Returns:
+            Iterator of SQL text chunks
+        """
+        logger.info(f"Streaming query for: {description}")
+        
+        system_blocks, user_message = self._create_prompt(
+            description,
+            schema_context
+        )
+        return self._stop_on_write(self.ai_service.generate_sql(
+            system_blocks,
+            user_message,
+            stream=True
+        ))
+    
+    def _stop_on_write(self, chunks: Iterator[str]) -> Iterator[str]:
+        """
+        Pass streamed SQL through, ending the stream early if the query
+        turns out to modify data
+        
+        The truncated text still fails validation in finalize(), which
+        then asks for a fixed query without waiting for the rest.
+        """
+        buffer = ''
+        try:
+            for chunk in chunks:
+                yield chunk
+                
+                if buffer is None:
+                    continue
+                
+                buffer += chunk
+                head = self._strip_fences(buffer).lstrip()
+                if len(head) >= _PREFIX_CHARS:
+                    if head.upper().startswith(_WRITE_PREFIXES):
+                        logger.warning("Stopped generating a data-modifying query")
+                        return
+                    buffer = None
+        finally:
+            # Closing the source cancels the underlying API request
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+    
+    @staticmethod
+    def _strip_fences(text: str) -> str:
+        """Remove Markdown code fences around generated SQL"""
+        return text.replace('```sql', '').replace('```', '')
+    
+    def finalize(self, query: str, schema_context: str) -> str:
+        """
+        Clean up and validate a generated query, fixing it if needed
         
-        # Get SQL from AI
-        query = self.ai_service.generate_sql(prompt)
+        Args:
+            query: Raw generated SQL text
+            schema_context: Formatted database schema
+            
+        Returns:
+            SQL query string
+        """
+        query = self._strip_fences(query).strip()
         
         # Validate query
         is_valid, error = self._validate_query(query)
@@ -51,40 +157,41 @@ class QueryGenerator:
         
         return query
     
-    def _create_prompt(self, description: str, schema: Dict) -> str:
-        """Create prompt for AI model"""
-        schema_str = self._format_schema(schema)
+    def _create_prompt(
+        self,
+        description: str,
+        schema: str
+    ) -> Tuple[List[Dict], str]:
+        """
+        Create prompt for AI model
         
-        prompt = f"""You are an expert MySQL query generator.
-
-Database Schema:
-{schema_str}
-
-User Request: {description}
-
-Generate a MySQL query that:
-1. Answers the user's request accurately
-2. Uses proper MySQL syntax
-3. Follows best practices (proper joins, WHERE clauses, etc.)
-4. Includes appropriate LIMIT clauses if needed
-5. Returns only the SQL query, no explanations
-
-SQL Query:"""
+        The instructions and schema form a static prefix that is
+        byte-identical across requests, so providers can cache it; only
+        the user message changes per question.
         
-        return prompt
+        Returns:
+            (system_blocks, user_message)
+        """
+        user_message = self._request_prefix + description + self._request_suffix
+        return self._system_blocks(schema), user_message
     
-    def _format_schema(self, schema: Dict) -> str:
-        """Format schema for prompt"""
-        formatted = []
-        
-        for table_name, table_info in schema.get('tables', {}).items():
-            columns = ', '.join([
-                f"{col['name']} ({col['type']})"
-                for col in table_info.get('columns', [])
-            ])
-            formatted.append(f"Table: {table_name}\nColumns: {columns}\n")
-        
-        return '\n'.join(formatted)
+    def _system_blocks(self, schema: str) -> List[Dict]:
+        """Build the cacheable instruction and schema prompt blocks"""
+        cached_schema, blocks = self._blocks_cache
+        if schema == cached_schema:
+            return blocks
+        
+        blocks = [
+            self._instructions_block,
+            {
+                "type": "text",
+                "text": "Database Schema:\n" + schema,
+                # Marks the end of the cacheable prefix
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
+        self._blocks_cache = (schema, blocks)
+        return blocks
     
     def _validate_query(self, query: str) -> tuple:
         """
@@ -99,30 +206,30 @@ SQL Query:"""
                 if any(word in query.upper() for word in ['DROP', 'DELETE', 'TRUNCATE', 'UPDATE', 'INSERT']):
                     return False, "Only SELECT queries are allowed"
             
-            # Try to explain the query (validates syntax)
-            self.db_manager.explain_query(query)
+            # Let MySQL parse and plan the query (validates syntax)
+            self.db_manager.validate_query(query)
             
             return True, None
             
         except Exception as e:
             return False, str(e)
     
-    def _fix_query(self, query: str, error: str, schema: Dict) -> str:
+    def _fix_query(self, query: str, error: str, schema: str) -> str:
         """Attempt to fix invalid query"""
         logger.info(f"Attempting to fix query error: {error}")
         
-        fix_prompt = f"""The following MySQL query has an error:
+        fix_message = f"""The following MySQL query has an error:
 
 Query: {query}
 Error: {error}
 
-Database Schema:
-{self._format_schema(schema)}
-
 Please provide a corrected version of the query that fixes the error.
 Return only the corrected SQL query, no explanations.
 
 Corrected Query:"""
         
-        fixed_query = self.ai_service.generate_sql(fix_prompt)
+        fixed_query = self.ai_service.generate_sql(
+            self._system_blocks(schema),
+            fix_message
+        )
         return fixed_query
@@ -2,26 +2,68 @@
 SQL Query Optimizer
 Analyzes and optimizes MySQL queries
 """
+import copy
 import logging
 import re
-from typing import Dict, List
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+try:
+    import sqlglot
+    from sqlglot import exp
+    _COMPARISONS = (
+        exp.EQ, exp.NEQ, exp.GT, exp.GTE, exp.LT, exp.LTE,
+        exp.In, exp.Between, exp.Like
+    )
+except ImportError:
+    logger.info("sqlglot package not found, using regex query checks")
+    sqlglot = None
+
+_RE_SELECT_STAR = re.compile(r'SELECT\s+\*', re.IGNORECASE)
+_RE_WHERE = re.compile(r'\bWHERE\b', re.IGNORECASE)
+_RE_FROM_TABLE = re.compile(r'FROM\s+(\w+)', re.IGNORECASE)
+_RE_WHERE_COL = re.compile(r'WHERE\s+(\w+)\s*[=<>]', re.IGNORECASE)
+_RE_JOIN_COL = re.compile(r'ON\s+\w+\.(\w+)\s*=', re.IGNORECASE)
+_RE_ORDER = re.compile(r'ORDER\s+BY\s+(\w+)', re.IGNORECASE)
+_RE_LIMIT = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+_RE_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"|\b\d+(?:\.\d+)?\b")
+_RE_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=256)
+def _parse(query: str):
+    """Parse a MySQL query once for every check, None if not parseable"""
+    if sqlglot is None:
+        return None
+    
+    try:
+        return sqlglot.parse_one(query, dialect='mysql')
+    except sqlglot.errors.SqlglotError as e:
+        logger.debug(f"Falling back to regex checks, parse failed: {e}")
+        return None
+
 
 class QueryOptimizer:
     """Optimizes MySQL queries for better performance"""
     
-    def __init__(self, db_manager, ai_service):
+    def __init__(self, db_manager, ai_service, cache_size: int = 1024):
         """
         Initialize query optimizer
         
         Args:
             db_manager: Database manager instance
             ai_service: AI service instance
+            cache_size: Maximum number of cached analyze() results
         """
         self.db_manager = db_manager
         self.ai_service = ai_service
+        self.cache_size = cache_size
+        self._analysis_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def optimize(self, query: str) -> Dict:
         """
@@ -39,10 +81,10 @@ class QueryOptimizer:
         execution_plan = self.db_manager.explain_query(query)
         
         # Find optimization opportunities
-        issues = self._find_issues(query, execution_plan)
+        issues, spans = self._find_issues(query, execution_plan)
         
         # Generate optimized query
-        optimized_query = self._generate_optimized_query(query, issues)
+        optimized_query = self._generate_optimized_query(query, issues, spans)
         
         # Get index suggestions
         index_suggestions = self.suggest_indexes(query)
@@ -67,28 +109,114 @@ class QueryOptimizer:
         """
         Analyze query without optimization
         
+        Results are cached by query shape (literals ignored) until
+        clear_cache() is called, e.g. after a schema change.
+        
         Args:
             query: SQL query to analyze
             
         Returns:
             Analysis results
         """
+        analysis = self._cached_analysis(query)
+        if analysis is not None:
+            return analysis
+        
         execution_plan = self.db_manager.explain_query(query)
-        issues = self._find_issues(query, execution_plan)
+        return self._build_analysis(query, execution_plan)
+    
+    async def analyze_async(self, query: str) -> Dict:
+        """
+        Analyze query without blocking the event loop on EXPLAIN
         
-        return {
+        Args:
+            query: SQL query to analyze
+            
+        Returns:
+            Analysis results
+        """
+        analysis = self._cached_analysis(query)
+        if analysis is not None:
+            return analysis
+        
+        execution_plan = await self.db_manager.explain_query_async(query)
+        return self._build_analysis(query, execution_plan)
+    
+    def _cached_analysis(self, query: str) -> Optional[Dict]:
+        """Return a copy of the cached analysis for the query's shape"""
+        key = self._normalize_query(query)
+        
+        with self._cache_lock:
+            cached = self._analysis_cache.get(key)
+            if cached is None:
+                return None
+            self._analysis_cache.move_to_end(key)
+        
+        analysis = copy.deepcopy(cached)
+        analysis['query'] = query
+        return analysis
+    
+    def _build_analysis(self, query: str, execution_plan: List[Dict]) -> Dict:
+        """Score the query's issues and cache the analysis"""
+        issues, _ = self._find_issues(query, execution_plan)
+        
+        analysis = {
             'query': query,
             'issues': issues,
             'execution_plan': execution_plan,
             'score': self._calculate_query_score(issues)
         }
+        
+        # An empty plan means EXPLAIN failed, so don't keep it
+        if execution_plan and self.cache_size > 0:
+            cached = copy.deepcopy(analysis)
+            with self._cache_lock:
+                self._analysis_cache[self._normalize_query(query)] = cached
+                if len(self._analysis_cache) > self.cache_size:
+                    self._analysis_cache.popitem(last=False)
+        
+        return analysis
     
-    def _find_issues(self, query: str, execution_plan: List[Dict]) -> List[Dict]:
-        """Find performance issues in query"""
+    def clear_cache(self):
+        """Drop cached analyze() results"""
+        with self._cache_lock:
+            self._analysis_cache.clear()
+    
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Reduce a query to its shape: lowercased, literals as ?"""
+        normalized = _RE_LITERAL.sub('?', query.lower())
+        return _RE_WHITESPACE.sub(' ', normalized).strip()
+    
+    def _find_issues(
+        self,
+        query: str,
+        execution_plan: List[Dict]
+    ) -> Tuple[List[Dict], Dict]:
+        """
+        Find performance issues in query
+        
+        Returns:
+            (issues, spans) where spans records what
+            _generate_optimized_query() needs to rewrite the query without
+            scanning it again: 'select_all' holds the (start, end) of each
+            select-list * or table.* and 'has_limit' whether a LIMIT is
+            present
+        """
         issues = []
+        spans = {}
+        tree = _parse(query)
         
-        # Check for SELECT *
-        if re.search(r'SELECT\s+\*', query, re.IGNORECASE):
+        # Check for SELECT *, taking spans from the same source as the check
+        if tree is not None:
+            select_all, spans['select_all'] = self._select_stars(tree)
+        else:
+            spans['select_all'] = [
+                (m.end() - 1, m.end()) for m in _RE_SELECT_STAR.finditer(query)
+            ]
+            select_all = bool(spans['select_all'])
+        
+        if select_all:
             issues.append({
                 'type': 'select_all',
                 'severity': 'medium',
@@ -97,17 +225,28 @@ class QueryOptimizer:
             })
         
         # Check for missing WHERE clause
-        if not re.search(r'WHERE', query, re.IGNORECASE):
-            if re.search(r'FROM\s+\w+', query, re.IGNORECASE):
-                issues.append({
-                    'type': 'no_where',
-                    'severity': 'high',
-                    'message': 'Query has no WHERE clause, may scan entire table',
-                    'suggestion': 'Add WHERE clause to filter results'
-                })
+        if tree is not None:
+            no_where = self._reads_without_where(tree)
+        else:
+            no_where = not _RE_WHERE.search(query) and _RE_FROM_TABLE.search(query)
+        
+        if no_where:
+            if tree is not None:
+                spans['has_limit'] = self._has_limit(tree)
+            else:
+                spans['has_limit'] = bool(_RE_LIMIT.search(query))
+            issues.append({
+                'type': 'no_where',
+                'severity': 'high',
+                'message': 'Query has no WHERE clause, may scan entire table',
+                'suggestion': 'Add WHERE clause to filter results'
+            })
         
-        # Check for table scans in execution plan
+        # Check execution plan steps in a single pass
         for step in execution_plan:
+            extra = step.get('Extra') or ''
+            
+            # Check for table scan
             if step.get('type') == 'ALL':
                 issues.append({
                     'type': 'table_scan',
@@ -116,20 +255,18 @@ class QueryOptimizer:
                     'message': f"Full table scan on {step.get('table')}",
                     'suggestion': 'Consider adding an index'
                 })
-        
-        # Check for filesort
-        for step in execution_plan:
-            if 'Using filesort' in step.get('Extra', ''):
+            
+            # Check for filesort
+            if 'Using filesort' in extra:
                 issues.append({
                     'type': 'filesort',
                     'severity': 'medium',
                     'message': 'Query requires filesort operation',
                     'suggestion': 'Add index on ORDER BY columns'
                 })
-        
-        # Check for temporary table
-        for step in execution_plan:
-            if 'Using temporary' in step.get('Extra', ''):
+            
+            # Check for temporary table
+            if 'Using temporary' in extra:
                 issues.append({
                     'type': 'temporary_table',
                     'severity': 'medium',
@@ -137,26 +274,33 @@ class QueryOptimizer:
                     'suggestion': 'Optimize joins or use covering index'
                 })
         
-        return issues
+        return issues, spans
     
-    def _generate_optimized_query(self, query: str, issues: List[Dict]) -> str:
-        """Generate optimized version of query"""
+    def _generate_optimized_query(
+        self,
+        query: str,
+        issues: List[Dict],
+        spans: Dict
+    ) -> str:
+        """Generate optimized version of query from _find_issues() output"""
         optimized = query
+        issue_types = {i['type'] for i in issues}
         
-        # Replace SELECT *
-        if any(i['type'] == 'select_all' for i in issues):
+        # Replace SELECT *, last first so earlier spans stay valid
+        if 'select_all' in issue_types:
             # In production, would analyze actual columns needed
-            optimized = re.sub(
-                r'SELECT\s+\*',
-                'SELECT id, name, created_at',  # Example
-                optimized,
-                flags=re.IGNORECASE
-            )
+            for start, end in sorted(spans.get('select_all', []), reverse=True):
+                # Keep a table.* qualifier on each column
+                qualifier = optimized[start:end - 1]
+                columns = ', '.join(
+                    qualifier + column
+                    for column in ('id', 'name', 'created_at')  # Example
+                )
+                optimized = optimized[:start] + columns + optimized[end:]
         
         # Add LIMIT if missing and no WHERE
-        if any(i['type'] == 'no_where' for i in issues):
-            if not re.search(r'LIMIT', optimized, re.IGNORECASE):
-                optimized += ' LIMIT 1000'
+        if 'no_where' in issue_types and not spans.get('has_limit'):
+            optimized += ' LIMIT 1000'
         
         return optimized
     
@@ -170,40 +314,154 @@ class QueryOptimizer:
         Returns:
             List of CREATE INDEX statements
         """
-        suggestions = []
+        tree = _parse(query)
+        if tree is not None:
+            filter_columns, order_columns = self._index_columns(tree)
+        else:
+            filter_columns, order_columns = self._index_columns_regex(query)
         
-        # Extract table and WHERE columns
-        tables = re.findall(r'FROM\s+(\w+)', query, re.IGNORECASE)
-        where_columns = re.findall(
-            r'WHERE\s+(\w+)\s*[=<>]',
-            query,
-            re.IGNORECASE
-        )
-        join_columns = re.findall(
-            r'ON\s+\w+\.(\w+)\s*=',
-            query,
-            re.IGNORECASE
-        )
-        order_columns = re.findall(
-            r'ORDER\s+BY\s+(\w+)',
-            query,
-            re.IGNORECASE
+        # One index per (table, columns); ORDER BY keeps its column order
+        indexes = {(table, column, (column,)) for table, column in filter_columns}
+        for table, columns in order_columns.items():
+            indexes.add((table, 'order', tuple(dict.fromkeys(columns))))
+        
+        return sorted(
+            f"CREATE INDEX idx_{table}_{name} ON {table}({', '.join(columns)});"
+            for table, name, columns in indexes
         )
+    
+    @staticmethod
+    def _select_stars(tree) -> Tuple[bool, List[Tuple[int, int]]]:
+        """
+        Find * and table.* in select lists (COUNT(*) is fine)
         
-        # Suggest indexes
-        for table in tables:
-            for column in set(where_columns + join_columns):
-                suggestions.append(
-                    f"CREATE INDEX idx_{table}_{column} ON {table}({column});"
-                )
-            
-            if order_columns:
-                order_cols = ', '.join(set(order_columns))
-                suggestions.append(
-                    f"CREATE INDEX idx_{table}_order ON {table}({order_cols});"
-                )
+        Returns:
+            (whether any were found, (start, end) source offsets of those
+            the parser recorded positions for)
+        """
+        found = False
+        spans = []
+        
+        for select in tree.find_all(exp.Select):
+            for column in select.expressions:
+                if isinstance(column, exp.Star):
+                    star, qualifiers = column, []
+                elif isinstance(column, exp.Column) and isinstance(column.this, exp.Star):
+                    star = column.this
+                    qualifiers = [
+                        column.args[part] for part in ('catalog', 'db', 'table')
+                        if column.args.get(part)
+                    ]
+                else:
+                    continue
+                
+                found = True
+                first = qualifiers[0] if qualifiers else star
+                if 'start' in first.meta and 'end' in star.meta:
+                    spans.append((first.meta['start'], star.meta['end'] + 1))
+        
+        return found, spans
+    
+    @staticmethod
+    def _top_level_selects(tree) -> List:
+        """SELECTs producing the result rows: the root and its UNION branches"""
+        if isinstance(tree, exp.Subquery):
+            return QueryOptimizer._top_level_selects(tree.this)
+        if isinstance(tree, exp.SetOperation):
+            return (
+                QueryOptimizer._top_level_selects(tree.this)
+                + QueryOptimizer._top_level_selects(tree.expression)
+            )
+        return [tree] if isinstance(tree, exp.Select) else []
+    
+    @staticmethod
+    def _reads_without_where(tree) -> bool:
+        """
+        Check for a top-level SELECT reading a table with no WHERE clause
+        
+        Subqueries are left out: they only feed the outer query, which
+        a LIMIT appended to the query would not apply to.
+        """
+        selects = {id(select) for select in QueryOptimizer._top_level_selects(tree)}
+        ctes = {cte.alias for cte in tree.find_all(exp.CTE)}
+        for table in tree.find_all(exp.Table):
+            if table.name in ctes:
+                continue
+            select = table.parent.parent if isinstance(table.parent, exp.From) else None
+            if id(select) in selects and not select.args.get('where'):
+                return True
+        return False
+    
+    @staticmethod
+    def _has_limit(tree) -> bool:
+        """Check for a LIMIT on the whole result rather than a subquery"""
+        while isinstance(tree, exp.Subquery) and not tree.args.get('limit'):
+            tree = tree.this
+        return tree.args.get('limit') is not None
+    
+    @staticmethod
+    def _index_columns(tree) -> Tuple[Set[Tuple[str, str]], Dict[str, List[str]]]:
+        """
+        Find indexable columns in a parsed query
+        
+        Columns are attributed to their table through qualifiers and
+        aliases, or to the FROM table of the SELECT they appear in.
+        
+        Returns:
+            ({(table, filter or join column)}, {table: ORDER BY columns})
+        """
+        ctes = {cte.alias for cte in tree.find_all(exp.CTE)}
+        aliases = {}
+        from_tables = {}
+        
+        for table in tree.find_all(exp.Table):
+            if table.name in ctes:
+                continue
+            aliases[table.alias_or_name] = table.name
+            if isinstance(table.parent, exp.From):
+                from_tables[id(table.parent.parent)] = table.name
+        
+        tables = set(aliases.values())
+        
+        def owner(column):
+            if column.table:
+                return aliases.get(column.table)
+            select = column.find_ancestor(exp.Select)
+            if select is not None and id(select) in from_tables:
+                return from_tables[id(select)]
+            return next(iter(tables)) if len(tables) == 1 else None
+        
+        filter_columns = set()
+        for where in tree.find_all(exp.Where):
+            for column in where.find_all(exp.Column):
+                if isinstance(column.parent, _COMPARISONS) and owner(column):
+                    filter_columns.add((owner(column), column.name))
+        
+        for join in tree.find_all(exp.Join):
+            condition = join.args.get('on')
+            for column in condition.find_all(exp.Column) if condition else []:
+                if owner(column):
+                    filter_columns.add((owner(column), column.name))
+        
+        order_columns = {}
+        for ordered in tree.find_all(exp.Ordered):
+            column = ordered.this
+            if isinstance(column, exp.Column) and owner(column):
+                order_columns.setdefault(owner(column), []).append(column.name)
+        
+        return filter_columns, order_columns
+    
+    @staticmethod
+    def _index_columns_regex(query: str) -> Tuple[Set[Tuple[str, str]], Dict[str, List[str]]]:
+        """Approximate _index_columns() with regexes for unparseable queries"""
+        tables = set(_RE_FROM_TABLE.findall(query))
+        columns = set(_RE_WHERE_COL.findall(query)) | set(_RE_JOIN_COL.findall(query))
+        order = _RE_ORDER.findall(query)
+        
+        filter_columns = {(table, column) for table in tables for column in columns}
+        order_columns = {table: order for table in tables if order}
         
-        return suggestions
+        return filter_columns, order_columns
     
     def _calculate_query_score(self, issues: List[Dict]) -> int:
         """Calculate query performance score (0-100)"""
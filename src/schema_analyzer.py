@@ -3,7 +3,9 @@ Database Schema Analyzer
 Analyzes and provides schema context
 """
 import logging
-from typing import Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -11,15 +13,25 @@ logger = logging.getLogger(__name__)
 class SchemaAnalyzer:
     """Analyzes database schema"""
     
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, max_workers: int = 4, load_timeout: float = 30.0):
         """
         Initialize schema analyzer
         
         Args:
             db_manager: Database manager instance
+            max_workers: Tables described concurrently, at most the
+                database connection pool size
+            load_timeout: Seconds to wait for a load already in progress
+                (e.g. the background warm-up) before loading separately
         """
         self.db_manager = db_manager
+        self.max_workers = max_workers
+        self.load_timeout = load_timeout
         self.schema_cache = None
+        self.schema_cache_formatted: Optional[str] = None
+        
+        # Callers arriving mid-load wait for it instead of analyzing again
+        self._load_lock = threading.Lock()
     
     def get_schema_context(self) -> Dict:
         """
@@ -31,8 +43,85 @@ class SchemaAnalyzer:
         if self.schema_cache:
             return self.schema_cache
         
-        self.schema_cache = self.analyze_schema()
-        return self.schema_cache
+        if not self._load_lock.acquire(timeout=self.load_timeout):
+            logger.warning("Timed out waiting for schema load, loading separately")
+            return self._load()
+        
+        try:
+            if not self.schema_cache:
+                return self._load()
+            return self.schema_cache
+        finally:
+            self._load_lock.release()
+    
+    def _load(self) -> Dict:
+        """Analyze the schema, caching it only if any tables were found"""
+        schema = self.analyze_schema()
+        
+        # Usually the database was unreachable; don't keep an empty schema
+        if not schema['tables']:
+            logger.warning("Schema load found no tables, will retry on next use")
+            return schema
+        
+        self.schema_cache = schema
+        return schema
+    
+    def warm(self) -> threading.Thread:
+        """
+        Load the schema in a background thread
+        
+        Returns:
+            The started daemon thread
+        """
+        def load():
+            try:
+                self.get_formatted_schema()
+            except Exception as e:
+                logger.error(f"Background schema load failed: {e}")
+        
+        thread = threading.Thread(target=load, name='schema-warm', daemon=True)
+        thread.start()
+        return thread
+    
+    def get_formatted_schema(self) -> str:
+        """
+        Get schema context formatted for AI prompts
+        
+        Built once per schema load, so repeated prompts reuse the same
+        string (and present providers with an identical prefix).
+        
+        Returns:
+            Schema description text
+        """
+        if self.schema_cache_formatted is not None:
+            return self.schema_cache_formatted
+        
+        schema = self.get_schema_context()
+        formatted = self.format_schema(schema)
+        
+        # An empty, uncached schema is not memoized either
+        if schema is self.schema_cache:
+            self.schema_cache_formatted = formatted
+        return formatted
+    
+    def clear_cache(self):
+        """Drop cached schema so it is re-analyzed on next use"""
+        self.schema_cache = None
+        self.schema_cache_formatted = None
+    
+    @staticmethod
+    def format_schema(schema: Dict) -> str:
+        """Format schema for prompt"""
+        formatted = []
+        
+        for table_name, table_info in schema.get('tables', {}).items():
+            columns = ', '.join([
+                f"{col['name']} ({col['type']})"
+                for col in table_info.get('columns', [])
+            ])
+            formatted.append(f"Table: {table_name}\nColumns: {columns}\n")
+        
+        return '\n'.join(formatted)
     
     def analyze_schema(self) -> Dict:
         """
@@ -43,12 +132,46 @@ class SchemaAnalyzer:
         """
         logger.info("Analyzing database schema")
         
+        # One information_schema query covers every table
+        table_schemas = self.db_manager.get_all_schemas()
+        if table_schemas:
+            return self.build_schema(table_schemas)
+        
+        return self.build_schema(self._describe_tables())
+    
+    def _describe_tables(self) -> Dict[str, List[Dict]]:
+        """Describe each table separately, used if the batch query fails"""
         tables = self.db_manager.get_tables()
-        schema = {'tables': {}}
         
-        for table in tables:
-            table_schema = self.db_manager.get_table_schema(table)
+        # Each worker checks out its own pooled connection
+        workers = min(self.max_workers, len(tables))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                table_schemas = dict(zip(
+                    tables,
+                    executor.map(self.db_manager.get_table_schema, tables)
+                ))
+        else:
+            table_schemas = {
+                table: self.db_manager.get_table_schema(table)
+                for table in tables
+            }
+        
+        return table_schemas
+    
+    def build_schema(self, table_schemas: Dict[str, List[Dict]]) -> Dict:
+        """
+        Build schema information from DESCRIBE-style column rows
+        
+        Args:
+            table_schemas: Mapping of table name to column rows
             
+        Returns:
+            Complete schema information
+        """
+        schema = {'tables': {}}
+        
+        for table, table_schema in table_schemas.items():
             schema['tables'][table] = {
                 'columns': [
                     {
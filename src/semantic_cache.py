@@ -0,0 +1,145 @@
+"""
+Semantic Answer Cache
+Reuses answers for questions that are paraphrases of earlier ones
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Caches results keyed by question embedding similarity"""
+    
+    def __init__(
+        self,
+        maxlen: int = 256,
+        threshold: float = 0.95,
+        ttl: Optional[float] = 300
+    ):
+        """
+        Initialize semantic cache
+        
+        Embeddings are stored unit-normalized in one contiguous float32
+        matrix, so a lookup is a single matrix-vector product. Once full,
+        the matrix is used as a ring buffer and the oldest row is replaced.
+        
+        Args:
+            maxlen: Maximum number of cached results, oldest evicted first
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds a result stays servable, None for no expiry
+        """
+        self.maxlen = maxlen
+        self.threshold = threshold
+        self.ttl = ttl
+        
+        # Shared by every session/thread using the assistant
+        self._lock = threading.Lock()
+        self.clear()
+    
+    def lookup(self, embedding: List[float]) -> Optional[Dict]:
+        """
+        Find the cached result for the most similar question
+        
+        Args:
+            embedding: Question embedding
+        
+        Returns:
+            Cached result, or None if nothing is similar enough
+        """
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+        
+        with self._lock:
+            if self._size == 0 or query.shape[0] != self._emb.shape[1]:
+                return None
+            
+            scores = self._emb[:self._size] @ query
+            if self.ttl is not None:
+                expired = self._stamps[:self._size] < time.monotonic() - self.ttl
+                scores[expired] = -np.inf
+            best = int(np.argmax(scores))
+            
+            # Written so a NaN score is a miss, not a hit
+            if not scores[best] >= self.threshold:
+                return None
+            
+            result = self._results[best]
+        
+        logger.info(f"Semantic cache hit (similarity {scores[best]:.3f})")
+        return result
+    
+    def insert(self, embedding: List[float], result: Dict):
+        """
+        Cache a result under its question embedding
+        
+        Args:
+            embedding: Question embedding
+            result: Result to return for similar questions
+        """
+        if self.maxlen <= 0:
+            return
+        
+        row = self._normalize(embedding)
+        if row is None:
+            return
+        
+        with self._lock:
+            self._insert(row, result)
+    
+    def _insert(self, row: np.ndarray, result: Dict):
+        """Store a normalized row; caller holds the lock"""
+        # A different embedding model invalidates everything cached
+        if self._emb.shape[1] != row.shape[0]:
+            self._reset()
+            self._emb = np.empty((0, row.shape[0]), dtype=np.float32)
+        
+        if self._size < self.maxlen:
+            # Grow by doubling so inserts copy the matrix O(log n) times
+            if self._size == self._emb.shape[0]:
+                capacity = min(self.maxlen, max(16, 2 * self._size))
+                grown = np.zeros((capacity, row.shape[0]), dtype=np.float32)
+                grown[:self._size] = self._emb[:self._size]
+                self._emb = grown
+                stamps = np.zeros(capacity)
+                stamps[:self._size] = self._stamps[:self._size]
+                self._stamps = stamps
+            slot = self._size
+            self._size += 1
+            self._results.append(result)
+        else:
+            slot = self._next
+            self._next = (self._next + 1) % self.maxlen
+            self._results[slot] = result
+        
+        self._emb[slot] = row
+        self._stamps[slot] = time.monotonic()
+    
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._reset()
+    
+    def _reset(self):
+        """Empty the cache; caller holds the lock"""
+        self._emb = np.empty((0, 0), dtype=np.float32)
+        self._stamps = np.empty(0)
+        self._results = []
+        self._size = 0
+        self._next = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        """Convert to a unit-length float32 vector, None if not normalizable"""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if not np.isfinite(norm) or norm == 0:
+            return None
+        return vector / norm
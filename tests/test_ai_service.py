@@ -0,0 +1,235 @@
+"""
+Tests for AI Service
+"""
+import json
+import threading
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, Mock
+from src.ai_service import AIService
+
+
+def live_service(**config):
+    """AI service with a fake client instead of mock responses"""
+    ai_service = AIService({'cache_dir': None, **config})
+    ai_service.mock_mode = False
+    ai_service.client = Mock()
+    return ai_service
+
+
+def stream_response(tokens):
+    """Streaming completion yielding one chunk per token"""
+    response = MagicMock()
+    response.__iter__.return_value = iter([
+        Mock(choices=[Mock(delta=Mock(content=token))])
+        for token in tokens
+    ])
+    return response
+
+
+class TestAIService:
+    """Test AI service helpers"""
+    
+    def test_summarize_results_sketch(self):
+        """Test that result summaries stay bounded however many rows there are"""
+        ai_service = AIService({'cache_dir': None})
+        
+        results = pd.DataFrame({
+            'id': range(10000),
+            'note': ['x' * 500] * 10000,
+            'payload': [b'\x00'] * 10000
+        })
+        sketch = json.loads(ai_service._summarize_results(results))
+        
+        assert sketch['shape'] == [10000, 3]
+        assert len(sketch['head']) == len(sketch['tail']) == ai_service.SKETCH_ROWS
+        assert sketch['tail'][-1]['id'] == 9999
+        assert sketch['describe']['id']['max'] == 9999
+        assert len(sketch['head'][0]['note']) == ai_service.SAMPLE_TEXT_MAX
+        assert 'payload' not in sketch['head'][0]
+    
+    def test_explain_results_duplicate_columns(self):
+        """Test that repeated labels from a join don't break summaries"""
+        ai_service = live_service()
+        ai_service._chat = Mock(return_value="Two ids and a name.")
+        
+        results = pd.DataFrame([[1, 2, 'x']], columns=['id', 'id', 'name'])
+        explanation = ai_service.explain_results("Orders?", "SELECT o.id, c.id, c.name ...", results)
+        
+        assert explanation == "Two ids and a name."
+        prompt = ai_service._chat.call_args[0][1][1]['content']
+        sketch = json.loads(prompt.split('Results Summary:\n')[1].split('\n\n')[0])
+        assert sketch['head'] == [{'id': 1, 'id_2': 2, 'name': 'x'}]
+    
+    def test_compact_sample_duplicate_columns(self):
+        """Test compaction by position keeps duplicate labels and drops binary"""
+        ai_service = live_service()
+        
+        sample = pd.DataFrame([[1, 'y' * 100, b'\x00']], columns=['id', 'id', 'blob'])
+        compact = ai_service._compact_sample(sample)
+        
+        assert list(compact.columns) == ['id', 'id']
+        assert compact.iloc[0, 0] == 1
+        assert compact.iloc[0, 1] == 'y' * ai_service.SAMPLE_TEXT_MAX
+    
+    def test_summarize_results_all_columns_dropped(self):
+        """Test a result whose only column is binary, e.g. SELECT avatar"""
+        ai_service = live_service()
+        
+        results = pd.DataFrame({'avatar': [b'\x89PNG'] * 10})
+        sketch = json.loads(ai_service._summarize_results(results))
+        
+        assert sketch['shape'] == [10, 1]
+        assert 'describe' not in sketch
+        assert 'tail' not in sketch
+    
+    def test_explain_results_falls_back_on_summary_error(self):
+        """Test that a summarizer failure degrades to the row count"""
+        ai_service = live_service()
+        ai_service._summarize_results = Mock(side_effect=ValueError("bad frame"))
+        
+        results = pd.DataFrame({'id': [1, 2]})
+        
+        assert ai_service.explain_results("Q", "SELECT id", results) == "Query returned 2 rows."
+        assert list(ai_service.explain_results("Q", "SELECT id", results, stream=True)) == [
+            "Query returned 2 rows."
+        ]
+    
+    def test_cache_key(self):
+        """Test that cache keys depend on model, messages and parameters"""
+        ai_service = live_service()
+        messages = [{'role': 'user', 'content': 'hi'}]
+        
+        key = ai_service._cache_key('gpt-4', messages, temperature=0.3, max_tokens=10)
+        
+        assert key == ai_service._cache_key('gpt-4', messages, max_tokens=10, temperature=0.3)
+        assert key != ai_service._cache_key('gpt-4o-mini', messages, temperature=0.3, max_tokens=10)
+        assert key != ai_service._cache_key('gpt-4', messages, temperature=0.5, max_tokens=10)
+    
+    def test_memory_cache_evicts_least_recently_used(self):
+        """Test the in-process LRU keeps cache_size entries"""
+        ai_service = live_service(cache_size=2)
+        ai_service._cache_set('a', 'A')
+        ai_service._cache_set('b', 'B')
+        ai_service._cache_get('a')
+        ai_service._cache_set('c', 'C')
+        
+        assert ai_service._cache_get('a') == 'A'
+        assert ai_service._cache_get('b') is None
+        assert ai_service._cache_get('c') == 'C'
+    
+    def test_cache_ttl_on_shared_layers(self):
+        """Test that disk and Redis entries expire after cache_ttl"""
+        ai_service = live_service(cache_ttl=60, cache_size=0)
+        ai_service._disk_cache = Mock()
+        ai_service._disk_cache.get.return_value = None
+        ai_service._redis = Mock()
+        
+        ai_service._cache_set('k', 'text')
+        
+        ai_service._disk_cache.set.assert_called_with('k', 'text', expire=60)
+        ai_service._redis.setex.assert_called_with('ai:k', 60, b'text')
+        
+        ai_service._redis.get.return_value = b'shared'
+        assert ai_service._cache_get('other') == 'shared'
+        ai_service._disk_cache.set.assert_called_with('other', 'shared', expire=60)
+    
+    def test_memory_cache_concurrent_access(self):
+        """Test that concurrent reads and evictions don't raise"""
+        ai_service = live_service(cache_size=8)
+        errors = []
+        
+        def churn(offset):
+            try:
+                for i in range(2000):
+                    key = str((i + offset) % 16)
+                    ai_service._cache_set(key, key)
+                    ai_service._cache_get(key)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=churn, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert len(ai_service._memory_cache) == 8
+    
+    def test_generate_table_descriptions(self):
+        """Test that batched JSON descriptions are parsed per table"""
+        ai_service = live_service()
+        ai_service.DESCRIPTION_BATCH = 2
+        ai_service._chat = Mock(side_effect=[
+            '```json\n{"users": "People who sign up.", "orders": "Purchases."}\n```',
+            '{"items": "Products for sale."}'
+        ])
+        schemas = {
+            name: [{'Field': 'id'}]
+            for name in ['users', 'orders', 'items']
+        }
+        
+        descriptions = ai_service.generate_table_descriptions(schemas)
+        
+        assert descriptions == {
+            'users': 'People who sign up.',
+            'orders': 'Purchases.',
+            'items': 'Products for sale.'
+        }
+        assert ai_service._chat.call_count == 2
+    
+    def test_generate_table_descriptions_fallback(self):
+        """Test that bad or partial responses fall back per table"""
+        ai_service = live_service()
+        ai_service.DESCRIPTION_BATCH = 2
+        ai_service._chat = Mock(side_effect=[
+            '{"users": "People who sign up."}',
+            'not json'
+        ])
+        schemas = {
+            name: [{'Field': 'id'}]
+            for name in ['users', 'orders', 'items']
+        }
+        
+        descriptions = ai_service.generate_table_descriptions(schemas)
+        
+        assert descriptions == {
+            'users': 'People who sign up.',
+            'orders': 'Table: orders',
+            'items': 'Table: items'
+        }
+    
+    def test_stream_chat_caches_complete_response(self):
+        """Test that a fully read stream is closed and cached"""
+        ai_service = live_service()
+        response = stream_response(['SELECT ', '1 '])
+        ai_service.client.chat.completions.create.return_value = response
+        messages = [{"role": "user", "content": "q"}]
+        
+        tokens = list(ai_service._stream_chat('model', messages, 0.1, 50))
+        
+        assert tokens == ['SELECT ', '1 ']
+        response.close.assert_called_once()
+        assert list(ai_service._stream_chat('model', messages, 0.1, 50)) == ['SELECT 1']
+        assert ai_service.client.chat.completions.create.call_count == 1
+    
+    def test_stream_chat_early_exit(self):
+        """Test that stopping early closes the response without caching"""
+        ai_service = live_service()
+        response = stream_response(['DELETE ', 'FROM ', 'users'])
+        ai_service.client.chat.completions.create.return_value = response
+        messages = [{"role": "user", "content": "q"}]
+        
+        stream = ai_service._stream_chat('model', messages, 0.1, 50)
+        assert next(stream) == 'DELETE '
+        stream.close()
+        
+        response.close.assert_called_once()
+        key = ai_service._cache_key(
+            'model',
+            messages,
+            temperature=0.1,
+            max_tokens=50
+        )
+        assert ai_service._cache_get(key) is None
@@ -0,0 +1,105 @@
+"""
+Tests for the CLI server
+"""
+import argparse
+import asyncio
+import os
+import stat
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+import cli
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve a stub assistant on a temporary socket"""
+    assistant = Mock()
+    socket_path = str(tmp_path / 'ai.sock')
+    
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(cli._serve(assistant, socket_path))
+    
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    yield assistant, socket_path
+    
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def command(socket_path, name, **args):
+    """Parsed arguments for a CLI command"""
+    return argparse.Namespace(command=name, socket=socket_path, **args)
+
+
+class TestServe:
+    """Test commands sent to a running server"""
+    
+    def test_output(self, server, capsys):
+        """Test that printed output and a zero status reach the client"""
+        assistant, socket_path = server
+        assistant.optimize_query.return_value = {
+            'original_query': 'SELECT * FROM users',
+            'optimized_query': 'SELECT id FROM users',
+            'issues_found': [],
+            'index_suggestions': []
+        }
+        
+        status = cli.run_remote(command(socket_path, 'optimize', query='SELECT * FROM users'))
+        
+        assert status == 0
+        assert 'Optimized Query:\nSELECT id FROM users' in capsys.readouterr().out
+        assistant.optimize_query.assert_called_once_with('SELECT * FROM users')
+    
+    def test_streamed_output(self, server, capsys):
+        """Test that streamed chunks reach the client"""
+        assistant, socket_path = server
+        assistant.explain_query.return_value = iter(['Reads ', 'every ', 'user.'])
+        
+        status = cli.run_remote(command(socket_path, 'explain', query='SELECT 1'))
+        
+        assert status == 0
+        assert 'Reads every user.' in capsys.readouterr().out
+    
+    def test_error_output(self, server, capsys):
+        """Test that a failing command reports its error and a non-zero status"""
+        assistant, socket_path = server
+        assistant.optimize_query.side_effect = Exception("boom")
+        
+        status = cli.run_remote(command(socket_path, 'optimize', query='SELECT 1'))
+        
+        assert status == 1
+        assert '❌ Error: boom' in capsys.readouterr().out
+    
+    def test_socket_is_owner_only(self, server):
+        """Test that the socket is created without group or other access"""
+        _, socket_path = server
+        
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077 == 0
+    
+    def test_no_server(self, tmp_path):
+        """Test that a missing socket falls back to running in-process"""
+        assert cli.run_remote(command(str(tmp_path / 'none.sock'), 'docs')) is None
+    
+    def test_foreign_socket_ignored(self, server):
+        """Test that another user's socket is never connected to"""
+        assistant, socket_path = server
+        
+        with patch('cli.os.getuid', return_value=os.getuid() + 1):
+            assert cli.run_remote(command(socket_path, 'docs')) is None
+        
+        assistant.generate_documentation.assert_not_called()
@@ -0,0 +1,134 @@
+"""
+Tests for Database Manager
+"""
+import threading
+from decimal import Decimal
+import pytest
+from unittest.mock import Mock, patch
+from src.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def db_manager():
+    """Database manager with the connection pool mocked out"""
+    with patch('src.database_manager.pooling.MySQLConnectionPool'):
+        yield DatabaseManager({'pool_size': 2, 'fetch_batch_size': 2})
+
+
+def make_cursor(names, rows):
+    """Cursor returning rows in fetchmany batches"""
+    cursor = Mock()
+    cursor.description = None if names is None else [(name,) for name in names]
+    batches = [rows[i:i + 2] for i in range(0, len(rows), 2)] + [[]]
+    cursor.fetchmany.side_effect = batches
+    return cursor
+
+
+class TestDatabaseManager:
+    """Test result fetching"""
+    
+    def test_fetch_table_types(self, db_manager):
+        """Test unsigned BIGINTs, NULLs and binary values across batches"""
+        rows = [
+            (2 ** 64 - 1, None, b'\x00\x01'),
+            (1, 'a', None),
+            (None, 'b', b'\xff')
+        ]
+        table = db_manager._fetch_table(make_cursor(['id', 'name', 'data'], rows))
+        
+        assert table.num_rows == 3
+        assert table.column('id').to_pylist() == [2 ** 64 - 1, 1, None]
+        assert table.column('name').to_pylist() == [None, 'a', 'b']
+        assert table.column('data').to_pylist() == [b'\x00\x01', None, b'\xff']
+    
+    def test_fetch_table_decimals_as_floats(self, db_manager):
+        """Test that DECIMAL values become floats that can be summarized"""
+        rows = [(Decimal('1.50'),), (None,), (Decimal('2.25'),)]
+        table = db_manager._fetch_table(make_cursor(['price'], rows))
+        
+        df = table.to_pandas()
+        assert df['price'].dtype == 'float64'
+        assert df['price'].max() == 2.25
+    
+    def test_fetch_table_mixed_values_fall_back_to_strings(self, db_manager):
+        """Test that values Arrow cannot type together become strings"""
+        table = db_manager._fetch_table(make_cursor(['v'], [(1,), ('x',)]))
+        
+        assert table.column('v').to_pylist() == ['1', 'x']
+    
+    def test_fetch_table_empty(self, db_manager):
+        """Test empty results and statements without a result set"""
+        table = db_manager._fetch_table(make_cursor(['id', 'name'], []))
+        assert table.num_rows == 0
+        assert table.column_names == ['id', 'name']
+        
+        assert db_manager._fetch_table(make_cursor(None, [])).num_columns == 0
+    
+    def test_get_all_schemas_groups_by_table(self, db_manager):
+        """Test that catalog rows are grouped into per-table column lists"""
+        cursor = db_manager.pool.get_connection.return_value.cursor.return_value
+        cursor.fetchall.return_value = [
+            {'table_name': 'orders', 'Field': 'id', 'Type': 'int'},
+            {'table_name': 'orders', 'Field': 'user_id', 'Type': 'int'},
+            {'table_name': 'users', 'Field': 'id', 'Type': 'int'}
+        ]
+        
+        schemas = db_manager.get_all_schemas()
+        
+        assert schemas == {
+            'orders': [
+                {'Field': 'id', 'Type': 'int'},
+                {'Field': 'user_id', 'Type': 'int'}
+            ],
+            'users': [{'Field': 'id', 'Type': 'int'}]
+        }
+        cursor.close.assert_called_once()
+    
+    def test_get_all_schemas_error(self, db_manager):
+        """Test that a failed catalog query returns no schemas"""
+        db_manager.pool.get_connection.side_effect = Exception("gone")
+        
+        assert db_manager.get_all_schemas() == {}
+    
+    def test_cursor_waits_for_free_connection(self):
+        """Test that an exhausted pool blocks checkout instead of raising"""
+        with patch('src.database_manager.pooling.MySQLConnectionPool'):
+            db_manager = DatabaseManager({'pool_size': 1})
+        
+        entered = threading.Event()
+        
+        def second_checkout():
+            with db_manager.cursor():
+                entered.set()
+        
+        with db_manager.cursor():
+            thread = threading.Thread(target=second_checkout)
+            thread.start()
+            
+            assert not entered.wait(0.2)
+            assert db_manager.pool.get_connection.call_count == 1
+        
+        thread.join(timeout=5)
+        
+        assert entered.is_set()
+        assert db_manager.pool.get_connection.call_count == 2
+        assert db_manager.pool.get_connection.return_value.close.call_count == 2
+    
+    def test_quote_identifier(self):
+        """Test that embedded backticks are doubled"""
+        assert DatabaseManager.quote_identifier('users') == '`users`'
+        assert DatabaseManager.quote_identifier('a`b') == '`a``b`'
+        assert DatabaseManager.quote_identifier('x`; DROP TABLE y; --') == \
+            '`x``; DROP TABLE y; --`'
+    
+    def test_table_names_quoted(self, db_manager):
+        """Test that DESCRIBE and COUNT(*) interpolate the quoted name"""
+        cursor = Mock()
+        db_manager._describe(cursor, 'a`b')
+        cursor.execute.assert_called_once_with("DESCRIBE `a``b`")
+        
+        cursor = db_manager.pool.get_connection.return_value.cursor.return_value
+        cursor.fetchone.return_value = (3,)
+        
+        assert db_manager.get_exact_row_count('a`b') == 3
+        cursor.execute.assert_called_once_with("SELECT COUNT(*) FROM `a``b`")
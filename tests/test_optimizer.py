@@ -1,8 +1,9 @@
 """
 Tests for Query Optimizer
 """
+import asyncio
 import pytest
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 from src.query_optimizer import QueryOptimizer
 
 
@@ -17,11 +18,19 @@ class TestQueryOptimizer:
         optimizer = QueryOptimizer(db_manager, ai_service)
         
         query = "SELECT * FROM customers"
-        issues = optimizer._find_issues(query, [])
+        issues, _ = optimizer._find_issues(query, [])
         
         issue_types = [i['type'] for i in issues]
         assert 'select_all' in issue_types
     
+    def test_count_star_is_not_select_all(self):
+        """Test that COUNT(*) is not reported as SELECT *"""
+        optimizer = QueryOptimizer(Mock(), Mock())
+        
+        issues, _ = optimizer._find_issues("SELECT COUNT(*) FROM orders WHERE id > 1", [])
+        
+        assert issues == []
+    
     def test_find_no_where_issue(self):
         """Test detection of missing WHERE clause"""
         db_manager = Mock()
@@ -30,11 +39,148 @@ class TestQueryOptimizer:
         optimizer = QueryOptimizer(db_manager, ai_service)
         
         query = "SELECT name FROM customers"
-        issues = optimizer._find_issues(query, [])
+        issues, _ = optimizer._find_issues(query, [])
         
         issue_types = [i['type'] for i in issues]
         assert 'no_where' in issue_types
     
+    def test_no_where_ignores_subqueries(self):
+        """Test that only the SELECTs producing the result need a WHERE"""
+        optimizer = QueryOptimizer(Mock(), Mock())
+        
+        query = "SELECT name FROM a WHERE id IN (SELECT a_id FROM b)"
+        issues, _ = optimizer._find_issues(query, [])
+        
+        assert issues == []
+        
+        query = "SELECT name FROM a WHERE id > 1 UNION (SELECT name FROM b)"
+        issues, _ = optimizer._find_issues(query, [])
+        
+        assert [i['type'] for i in issues] == ['no_where']
+    
+    def test_no_where_limit_on_outer_query(self):
+        """Test that a subquery LIMIT doesn't count as limiting the result"""
+        optimizer = QueryOptimizer(Mock(), Mock())
+        
+        query = "SELECT name FROM a JOIN (SELECT a_id FROM b LIMIT 5) t ON t.a_id = a.id"
+        issues, spans = optimizer._find_issues(query, [])
+        optimized = optimizer._generate_optimized_query(query, issues, spans)
+        
+        assert optimized == query + " LIMIT 1000"
+    
+    def test_find_execution_plan_issues(self):
+        """Test detection of plan issues, including NULL Extra values"""
+        db_manager = Mock()
+        ai_service = Mock()
+        
+        optimizer = QueryOptimizer(db_manager, ai_service)
+        
+        plan = [
+            {'table': 'orders', 'type': 'ALL', 'Extra': 'Using temporary; Using filesort'},
+            {'table': 'customers', 'type': 'eq_ref', 'Extra': None}
+        ]
+        issues, _ = optimizer._find_issues("SELECT id FROM orders WHERE id > 1", plan)
+        
+        issue_types = [i['type'] for i in issues]
+        assert issue_types == ['table_scan', 'filesort', 'temporary_table']
+    
+    def test_generate_optimized_query_from_spans(self):
+        """Test rewriting the query from the spans found with the issues"""
+        optimizer = QueryOptimizer(Mock(), Mock())
+        
+        query = "SELECT * FROM customers"
+        issues, spans = optimizer._find_issues(query, [])
+        optimized = optimizer._generate_optimized_query(query, issues, spans)
+        
+        assert optimized == "SELECT id, name, created_at FROM customers LIMIT 1000"
+        
+        query = "SELECT * FROM customers LIMIT 5"
+        issues, spans = optimizer._find_issues(query, [])
+        optimized = optimizer._generate_optimized_query(query, issues, spans)
+        
+        assert optimized == "SELECT id, name, created_at FROM customers LIMIT 5"
+    
+    def test_generate_optimized_query_uses_parsed_stars(self):
+        """Test that table.* is rewritten and * inside a string is left alone"""
+        optimizer = QueryOptimizer(Mock(), Mock())
+        
+        query = "SELECT a.* FROM a WHERE note = 'SELECT * from x'"
+        issues, spans = optimizer._find_issues(query, [])
+        optimized = optimizer._generate_optimized_query(query, issues, spans)
+        
+        assert optimized == (
+            "SELECT a.id, a.name, a.created_at FROM a WHERE note = 'SELECT * from x'"
+        )
+    
+    def test_analyze_caches_by_query_shape(self):
+        """Test that queries differing only in literals share one EXPLAIN"""
+        db_manager = Mock()
+        db_manager.explain_query.return_value = [{'table': 'orders', 'type': 'ALL'}]
+        ai_service = Mock()
+        
+        optimizer = QueryOptimizer(db_manager, ai_service)
+        
+        first = optimizer.analyze("SELECT id FROM orders WHERE total > 100")
+        second = optimizer.analyze("select id  from orders where total > 250")
+        
+        assert db_manager.explain_query.call_count == 1
+        assert second['query'] == "select id  from orders where total > 250"
+        assert second['issues'] == first['issues']
+        
+        optimizer.clear_cache()
+        optimizer.analyze("SELECT id FROM orders WHERE total > 100")
+        assert db_manager.explain_query.call_count == 2
+    
+    def test_analyze_async_shares_cache(self):
+        """Test that async analysis fills and reuses the analyze() cache"""
+        db_manager = Mock()
+        db_manager.explain_query_async = AsyncMock(
+            return_value=[{'table': 'orders', 'type': 'ALL'}]
+        )
+        ai_service = Mock()
+        
+        optimizer = QueryOptimizer(db_manager, ai_service)
+        
+        first = asyncio.run(optimizer.analyze_async("SELECT id FROM orders WHERE id = 1"))
+        second = optimizer.analyze("SELECT id FROM orders WHERE id = 2")
+        
+        assert db_manager.explain_query_async.await_count == 1
+        db_manager.explain_query.assert_not_called()
+        assert second['issues'] == first['issues']
+    
+    def test_suggest_indexes_deduplicated(self):
+        """Test that repeated tables and columns yield one sorted suggestion each"""
+        optimizer = QueryOptimizer(Mock(), Mock())
+        
+        query = (
+            "SELECT o.id FROM orders o WHERE status = 'paid' "
+            "UNION SELECT o.id FROM orders o WHERE status = 'sent' ORDER BY id"
+        )
+        suggestions = optimizer.suggest_indexes(query)
+        
+        assert suggestions == [
+            "CREATE INDEX idx_orders_order ON orders(id);",
+            "CREATE INDEX idx_orders_status ON orders(status);"
+        ]
+    
+    def test_suggest_indexes_resolves_aliases(self):
+        """Test that join and filter columns are matched to their own tables"""
+        optimizer = QueryOptimizer(Mock(), Mock())
+        
+        query = (
+            "SELECT o.id, c.name FROM orders o "
+            "JOIN customers c ON c.id = o.customer_id "
+            "WHERE c.state = 'CA' ORDER BY o.created_at"
+        )
+        suggestions = optimizer.suggest_indexes(query)
+        
+        assert suggestions == [
+            "CREATE INDEX idx_customers_id ON customers(id);",
+            "CREATE INDEX idx_customers_state ON customers(state);",
+            "CREATE INDEX idx_orders_customer_id ON orders(customer_id);",
+            "CREATE INDEX idx_orders_order ON orders(created_at);"
+        ]
+    
     def test_calculate_query_score(self):
         """Test query score calculation"""
         db_manager = Mock()
@@ -0,0 +1,71 @@
+"""
+Tests for Query Assistant
+"""
+import pytest
+from unittest.mock import patch
+from src.database_manager import DatabaseManager
+from src.query_assistant import QueryAssistant
+
+
+@pytest.fixture
+def assistant():
+    """Query assistant with its database and AI components mocked out"""
+    with patch('src.query_assistant.DatabaseManager') as db_manager, \
+            patch('src.query_assistant.AIService'):
+        db_manager.return_value.pool_size = 2
+        assistant = QueryAssistant({'warm_schema': False, 'result_limit': 1000})
+        yield assistant
+        assistant.executor.shutdown()
+
+
+class TestQueryAssistant:
+    """Test query post-processing"""
+    
+    def test_result_limit_appended(self, assistant):
+        """Test that SELECT and WITH queries get a LIMIT"""
+        assert assistant._apply_result_limit("SELECT * FROM users") == \
+            "SELECT * FROM users\nLIMIT 1000"
+        
+        query = "WITH recent AS (SELECT * FROM orders) SELECT * FROM recent"
+        assert assistant._apply_result_limit(query) == f"{query}\nLIMIT 1000"
+    
+    def test_result_limit_trailing_semicolon(self, assistant):
+        """Test that a trailing semicolon is dropped before the LIMIT"""
+        assert assistant._apply_result_limit("SELECT 1; ") == "SELECT 1\nLIMIT 1000"
+    
+    def test_result_limit_trailing_comment(self, assistant):
+        """Test that a trailing comment doesn't swallow the LIMIT"""
+        limited = assistant._apply_result_limit("SELECT * FROM users -- all users")
+        
+        assert limited.splitlines() == [
+            "SELECT * FROM users -- all users",
+            "LIMIT 1000"
+        ]
+    
+    def test_result_limit_kept(self, assistant):
+        """Test that existing limits and non-SELECT statements are left alone"""
+        for query in [
+            "SELECT * FROM users LIMIT 10",
+            "select * from users limit 5 offset 5",
+            "SHOW TABLES",
+            "UPDATE users SET name = 'a'"
+        ]:
+            assert assistant._apply_result_limit(query) == query
+    
+    def test_result_limit_disabled(self, assistant):
+        """Test that a result_limit of 0 disables the LIMIT"""
+        assistant.result_limit = 0
+        
+        assert assistant._apply_result_limit("SELECT 1") == "SELECT 1"
+    
+    def test_analyze_table_quotes_name(self, assistant):
+        """Test that the sample query interpolates the quoted table name"""
+        db_manager = assistant.db_manager
+        db_manager.quote_identifier = DatabaseManager.quote_identifier
+        db_manager.get_schema_stats.return_value = ([], {})
+        
+        assistant.analyze_table('a`b')
+        
+        db_manager.execute_query.assert_called_once_with(
+            "SELECT * FROM `a``b` LIMIT 100"
+        )
@@ -12,26 +12,47 @@ class TestQueryGenerator:
     def test_generate_simple_query(self):
         """Test simple query generation"""
         ai_service = Mock()
-        ai_service.generate_sql.return_value = "SELECT * FROM customers LIMIT 10"
+        ai_service.generate_sql.return_value = iter(["SELECT * FROM ", "customers LIMIT 10"])
         
         db_manager = Mock()
-        db_manager.explain_query.return_value = []
+        db_manager.validate_query.return_value = {}
         
         generator = QueryGenerator(ai_service, db_manager)
         
         query = generator.generate(
             "Show me customers",
-            {'tables': {'customers': {'columns': []}}}
+            "Table: customers\nColumns: \n"
         )
         
         assert 'SELECT' in query.upper()
         assert 'customers' in query.lower()
     
+    def test_generate_stops_on_write_query(self):
+        """Test that a data-modifying answer is cut short and fixed"""
+        consumed = []
+        
+        def destructive():
+            for chunk in ["DROP", " TABLE", " customers", ";"]:
+                consumed.append(chunk)
+                yield chunk
+        
+        ai_service = Mock()
+        ai_service.generate_sql.side_effect = [destructive(), "SELECT id FROM customers"]
+        db_manager = Mock()
+        
+        generator = QueryGenerator(ai_service, db_manager)
+        
+        query = generator.generate("Remove customers", "Table: customers\nColumns: \n")
+        
+        assert query == "SELECT id FROM customers"
+        assert consumed == ["DROP", " TABLE"]
+        db_manager.validate_query.assert_not_called()
+    
     def test_validate_query_success(self):
         """Test query validation success"""
         ai_service = Mock()
         db_manager = Mock()
-        db_manager.explain_query.return_value = []
+        db_manager.validate_query.return_value = {'query_block': {}}
         
         generator = QueryGenerator(ai_service, db_manager)
         
@@ -40,6 +61,19 @@ class TestQueryGenerator:
         assert is_valid
         assert error is None
     
+    def test_validate_query_database_error(self):
+        """Test that errors raised by MySQL mark the query invalid"""
+        ai_service = Mock()
+        db_manager = Mock()
+        db_manager.validate_query.side_effect = Exception("Unknown column 'nme'")
+        
+        generator = QueryGenerator(ai_service, db_manager)
+        
+        is_valid, error = generator._validate_query("SELECT nme FROM customers")
+        
+        assert not is_valid
+        assert "Unknown column" in error
+    
     def test_validate_query_failure(self):
         """Test query validation failure"""
         ai_service = Mock()
@@ -51,3 +85,32 @@ class TestQueryGenerator:
         
         assert not is_valid
         assert error is not None
+    
+    def test_finalize_streamed_query(self):
+        """Test cleanup of streamed query text"""
+        ai_service = Mock()
+        ai_service.generate_sql.return_value = iter(["```sql\nSELECT *", " FROM customers\n```"])
+        db_manager = Mock()
+        db_manager.validate_query.return_value = {}
+        
+        generator = QueryGenerator(ai_service, db_manager)
+        schema = "Table: customers\nColumns: \n"
+        
+        streamed = ''.join(generator.generate_stream("Show me customers", schema))
+        query = generator.finalize(streamed, schema)
+        
+        assert query == "SELECT * FROM customers"
+    
+    def test_prompt_keeps_schema_in_static_prefix(self):
+        """Test that only the user message varies between requests"""
+        generator = QueryGenerator(Mock(), Mock())
+        schema = "Table: customers\nColumns: id (int)\n"
+        
+        blocks_a, message_a = generator._create_prompt("Show me customers", schema)
+        blocks_b, message_b = generator._create_prompt("Count customers", schema)
+        
+        assert blocks_a == blocks_b
+        assert 'customers' in blocks_a[-1]['text']
+        assert blocks_a[-1]['cache_control'] == {'type': 'ephemeral'}
+        assert "Show me customers" in message_a
+        assert message_a != message_b
@@ -0,0 +1,79 @@
+"""
+Tests for Schema Analyzer
+"""
+import threading
+import pytest
+from unittest.mock import Mock
+from src.schema_analyzer import SchemaAnalyzer
+
+
+class TestSchemaAnalyzer:
+    """Test schema loading"""
+    
+    def test_warm_loads_schema_once(self):
+        """Test that a caller arriving during the background load reuses it"""
+        release = threading.Event()
+        db_manager = Mock()
+        
+        def get_all_schemas():
+            release.wait(5)
+            return {'customers': [
+                {'Field': 'id', 'Type': 'int', 'Null': 'NO', 'Key': 'PRI', 'Default': None}
+            ]}
+        
+        db_manager.get_all_schemas.side_effect = get_all_schemas
+        
+        analyzer = SchemaAnalyzer(db_manager)
+        thread = analyzer.warm()
+        assert not analyzer.is_loaded()
+        
+        release.set()
+        schema = analyzer.get_formatted_schema()
+        thread.join(5)
+        
+        assert schema == "Table: customers\nColumns: id (int)\n"
+        assert analyzer.is_loaded()
+        assert db_manager.get_all_schemas.call_count == 1
+    
+    def test_empty_schema_is_not_cached(self):
+        """Test that a load finding no tables is retried on next use"""
+        db_manager = Mock()
+        db_manager.get_all_schemas.side_effect = [{}, {'customers': [
+            {'Field': 'id', 'Type': 'int', 'Null': 'NO', 'Key': 'PRI', 'Default': None}
+        ]}]
+        db_manager.get_tables.return_value = []
+        
+        analyzer = SchemaAnalyzer(db_manager)
+        
+        assert analyzer.get_formatted_schema() == ""
+        assert not analyzer.is_loaded()
+        assert analyzer.get_formatted_schema() == "Table: customers\nColumns: id (int)\n"
+        assert analyzer.is_loaded()
+    
+    def test_load_wait_times_out(self):
+        """Test that a stuck load doesn't block other callers forever"""
+        started = threading.Event()
+        release = threading.Event()
+        schema = {'customers': [
+            {'Field': 'id', 'Type': 'int', 'Null': 'NO', 'Key': 'PRI', 'Default': None}
+        ]}
+        calls = []
+        
+        def get_all_schemas():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                release.wait(5)
+            return schema
+        
+        db_manager = Mock()
+        db_manager.get_all_schemas.side_effect = get_all_schemas
+        
+        analyzer = SchemaAnalyzer(db_manager, load_timeout=0.1)
+        thread = analyzer.warm()
+        started.wait(5)
+        
+        assert analyzer.get_schema_context()['tables']['customers']
+        release.set()
+        thread.join(5)
+        assert len(calls) == 2
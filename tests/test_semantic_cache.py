@@ -0,0 +1,95 @@
+"""
+Tests for Semantic Cache
+"""
+import threading
+import time
+import numpy as np
+import pytest
+from src.semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Test semantic answer caching"""
+    
+    def test_lookup_similar_question(self):
+        """Test hit on a near-identical embedding and miss on a different one"""
+        cache = SemanticCache(threshold=0.95)
+        cache.insert([1.0, 0.0, 0.0], {'query': 'SELECT 1'})
+        
+        assert cache.lookup([0.99, 0.05, 0.0]) == {'query': 'SELECT 1'}
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+    
+    def test_evicts_oldest_entry(self):
+        """Test that the cache stays within maxlen"""
+        cache = SemanticCache(maxlen=2)
+        cache.insert([1.0, 0.0], {'query': 'first'})
+        cache.insert([0.0, 1.0], {'query': 'second'})
+        cache.insert([1.0, 1.0], {'query': 'third'})
+        
+        assert len(cache) == 2
+        assert cache.lookup([1.0, 0.0]) is None
+        assert cache.lookup([0.0, 1.0]) == {'query': 'second'}
+    
+    def test_clear(self):
+        """Test that clear drops every entry"""
+        cache = SemanticCache()
+        cache.insert([1.0, 0.0], {'query': 'SELECT 1'})
+        cache.clear()
+        
+        assert len(cache) == 0
+        assert cache.lookup([1.0, 0.0]) is None
+    
+    def test_ring_buffer_keeps_newest(self):
+        """Test growth past the initial capacity and wrap-around eviction"""
+        cache = SemanticCache(maxlen=20)
+        for i in range(25):
+            embedding = [0.0] * 25
+            embedding[i] = 1.0
+            cache.insert(embedding, {'query': f'SELECT {i}'})
+        
+        assert len(cache) == 20
+        for i in range(25):
+            embedding = [0.0] * 25
+            embedding[i] = 1.0
+            expected = {'query': f'SELECT {i}'} if i >= 5 else None
+            assert cache.lookup(embedding) == expected
+    
+    def test_nan_score_is_a_miss(self):
+        """Test that a NaN similarity never counts as a hit"""
+        cache = SemanticCache(threshold=0.95)
+        cache.insert([1.0, 0.0], {'query': 'SELECT 1'})
+        cache._emb[0] = np.nan
+        
+        assert cache.lookup([1.0, 0.0]) is None
+        assert cache.lookup([float('nan'), 0.0]) is None
+    
+    def test_concurrent_inserts(self):
+        """Test that parallel inserts keep embeddings and results aligned"""
+        cache = SemanticCache(maxlen=400)
+        
+        def insert_range(start):
+            for i in range(start, start + 100):
+                embedding = [0.0] * 400
+                embedding[i] = 1.0
+                cache.insert(embedding, {'query': f'SELECT {i}'})
+        
+        threads = [threading.Thread(target=insert_range, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(cache) == 400
+        for i in range(400):
+            embedding = [0.0] * 400
+            embedding[i] = 1.0
+            assert cache.lookup(embedding) == {'query': f'SELECT {i}'}
+    
+    def test_expired_results_are_not_served(self):
+        """Test that results older than the TTL are misses"""
+        cache = SemanticCache(ttl=60)
+        cache.insert([1.0, 0.0], {'query': 'SELECT 1'})
+        assert cache.lookup([1.0, 0.0]) == {'query': 'SELECT 1'}
+        
+        cache._stamps[0] = time.monotonic() - 61
+        assert cache.lookup([1.0, 0.0]) is None